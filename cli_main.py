@@ -4,6 +4,7 @@ Main entry point for the Project Structure Creator CLI executable.
 This script is specifically designed for PyInstaller packaging.
 """
 
+import multiprocessing
 import sys
 import os
 
@@ -17,6 +18,8 @@ else:
 
 def main():
     """Main entry point for CLI executable."""
+    # Spawned worker processes (Windows) must not re-run the application
+    multiprocessing.freeze_support()
     try:
         from project_structure_creator.main import main as cli_main
         cli_main()
@@ -0,0 +1,136 @@
+"""
+Minimal client for the Project Structure Creator daemon
+
+Forwards a spec to a daemon started with ``project-structure-creator serve``
+and prints the progress it streams back. Unlike ``--connect``, it imports
+only the standard library modules it needs, not the project_structure_creator
+package, so a call costs little more than interpreter startup:
+
+    project-structure-client structure.txt ./out [--socket PATH] [--dedup hardlink|reflink]
+
+The spec (a file, or '-' for stdin) is sent as it is; the daemon detects its
+format and compression. See project_structure_creator/daemon.py for the protocol.
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+
+USAGE = "usage: project-structure-client INPUT_FILE OUTPUT_DIR [--socket PATH] [--dedup hardlink|reflink]"
+
+# Bytes of the spec sent per write
+CHUNK_SIZE = 1 << 16
+
+
+def default_socket_path() -> str:
+    """Per-user socket location, preferring XDG_RUNTIME_DIR"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "project-structure-creator.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join("/tmp", f"project-structure-creator-{uid}.sock")
+
+
+def request(socket_path: str, target: str, write_spec, dedup=None, out=None) -> int:
+    """
+    Send one create request and print the daemon's progress messages.
+
+    The spec is written by ``write_spec(sock)`` on a separate thread, so
+    results can stream back while a large spec is still being uploaded.
+
+    Returns:
+        Number of entries processed
+
+    Raises:
+        ConnectionError: If the daemon cannot be reached or reports an error
+    """
+    out = out or sys.stdout
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError as e:
+        sock.close()
+        raise ConnectionError(f"Cannot connect to daemon at {socket_path}: {e}")
+
+    header = {"target": os.path.abspath(target), "dedup": dedup}
+    upload_error = []
+
+    def upload():
+        try:
+            sock.sendall(json.dumps(header).encode("utf-8") + b"\n")
+            write_spec(sock)
+        except OSError as e:
+            upload_error.append(e)
+        finally:
+            try:
+                sock.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+
+    sender = threading.Thread(target=upload, daemon=True)
+    sender.start()
+    try:
+        with sock.makefile("rb") as reader:
+            for raw in reader:
+                message = json.loads(raw)
+                if "log" in message:
+                    print(message["log"], file=out, flush=True)
+                elif message.get("ok"):
+                    return message.get("count", 0)
+                else:
+                    raise ConnectionError(message.get("error", "Daemon reported an error"))
+        raise ConnectionError(f"Daemon closed the connection early{': ' + str(upload_error[0]) if upload_error else ''}")
+    finally:
+        sender.join(timeout=1)
+        sock.close()
+
+
+def send_file(spec):
+    """Spec writer copying a binary file object to the socket unchanged"""
+    def write(sock):
+        while True:
+            chunk = spec.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            sock.sendall(chunk)
+    return write
+
+
+def main(argv=None) -> None:
+    """Entry point of the project-structure-client command"""
+    args = list(sys.argv[1:] if argv is None else argv)
+    options = {"--socket": None, "--dedup": None}
+    positional = []
+    while args:
+        arg = args.pop(0)
+        if arg in ("-h", "--help"):
+            print(USAGE)
+            return
+        if arg in options:
+            if not args:
+                sys.exit(f"{USAGE}\nerror: {arg} needs a value")
+            options[arg] = args.pop(0)
+        else:
+            positional.append(arg)
+    if len(positional) != 2:
+        sys.exit(USAGE)
+    input_file, output_dir = positional
+
+    try:
+        if input_file == "-":
+            count = request(options["--socket"] or default_socket_path(), output_dir,
+                            send_file(sys.stdin.buffer), options["--dedup"])
+        else:
+            with open(input_file, "rb") as spec:
+                count = request(options["--socket"] or default_socket_path(), output_dir,
+                                send_file(spec), options["--dedup"])
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    print(f"\n✅ Project structure created successfully at '{output_dir}/' ({count} entries)")
+
+
+if __name__ == "__main__":
+    main()
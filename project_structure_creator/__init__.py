@@ -7,6 +7,6 @@ A tool to create project structures from text descriptions.
 __version__ = "0.1.0"
 __author__ = "Wiradjuri"
 
-from .main import main, parse_structure, create_structure
+from .main import main, parse_structure, iter_structure, create_structure, create_structure_stream
 
-__all__ = ["main", "parse_structure", "create_structure"]
+__all__ = ["main", "parse_structure", "iter_structure", "create_structure", "create_structure_stream"]
@@ -0,0 +1,246 @@
+"""
+Asyncio API for Project Structure Creator
+
+Async counterparts of parse_structure and create_structure for use inside
+event-loop based services. Parsing and every blocking file system call run
+in worker threads, entries and progress are delivered as async iterators,
+and the number of operations in flight is bounded so a large structure
+cannot flood the executor or starve other tasks on the loop.
+
+Example:
+    async for progress in create_structure_async("/srv/tenant", lines):
+        print(progress.status, progress.path)
+"""
+
+import asyncio
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .content import split_size_annotation, write_content
+from .expand import expand_braces
+from .main import StructureParseError, iter_structure
+from .throttle import OpScheduler, no_op
+
+Lines = Union[Iterable[str], AsyncIterable[str]]
+
+# Number of queued input lines before an async line source is paused
+_LINE_QUEUE_SIZE = 4096
+
+_END = object()
+
+
+class Progress(NamedTuple):
+    """Outcome of one created entry"""
+
+    path: str
+    is_dir: bool
+    status: str  # "created" or "skipped"
+
+
+async def parse_structure_async(lines: Lines, batch_size: int = 512,
+                                executor: Optional[Executor] = None) -> AsyncIterator[Tuple[str, bool]]:
+    """
+    Parse a structure without blocking the event loop.
+
+    Lines may come from a regular iterable (list, open file) or an async
+    iterable (e.g. a network stream). Parsing runs in a worker thread and
+    entries are handed back in batches, so they can be consumed while input
+    is still arriving. A batch from an async source ends early when the
+    source has no more lines ready, so a slow producer never holds back
+    entries that are already parsed.
+
+    Args:
+        lines: Iterable or async iterable of lines
+        batch_size: Maximum number of entries parsed per executor call
+        executor: Executor for the parser thread (default: the loop's default)
+
+    Yields:
+        Tuples (path, is_directory)
+
+    Raises:
+        StructureParseError: If the input format cannot be parsed
+    """
+    loop = asyncio.get_running_loop()
+    cancelled = threading.Event()
+    pump = None
+
+    # Whether the parser can read another line without waiting on the source
+    ready = None
+    if hasattr(lines, "__aiter__"):
+        line_queue = queue.Queue(maxsize=_LINE_QUEUE_SIZE)
+        pump = asyncio.ensure_future(_pump_lines(lines, line_queue, cancelled))
+        source = _drain_queue(line_queue, cancelled)
+
+        def ready() -> bool:
+            return not line_queue.empty()
+    else:
+        source = _until_cancelled(lines, cancelled)
+
+    entries = iter_structure(source)
+    try:
+        while True:
+            batch = await loop.run_in_executor(executor, _next_batch, entries, batch_size, ready)
+            if not batch:
+                break
+            for entry in batch:
+                yield entry
+        if pump is not None:
+            # Surface errors raised by the async line source
+            await pump
+    finally:
+        cancelled.set()
+        if pump is not None and not pump.done():
+            pump.cancel()
+
+
+async def create_structure_async(base_path: str, lines: Lines, max_workers: int = 4,
+                                 max_pending: int = 64,
+                                 executor: Optional[Executor] = None,
+                                 scheduler: Optional[OpScheduler] = None) -> AsyncIterator[Progress]:
+    """
+    Create a project structure without blocking the event loop.
+
+    Entries are created as they are parsed. Blocking file system calls run on
+    a bounded thread pool with at most ``max_pending`` operations in flight;
+    when that limit is reached, parsing pauses until earlier operations
+    finish. Progress is yielded in input order.
+
+    Cancelling the consuming task (or closing the iterator early) stops
+    parsing, cancels queued operations and releases the pool without
+    waiting for them.
+
+    Args:
+        base_path: Base directory where the structure will be created
+        lines: Iterable or async iterable of lines
+        max_workers: Size of the thread pool created when no executor is given
+        max_pending: Maximum number of file system operations in flight
+        executor: Optional shared executor, e.g. one pool for many requests
+        scheduler: Optional OpScheduler; its waits happen in the worker
+            threads, so throttling never blocks the event loop
+
+    Yields:
+        Progress for every created or skipped entry
+
+    Raises:
+        StructureParseError: If the structure cannot be parsed
+        OSError: If file/directory creation fails
+    """
+    loop = asyncio.get_running_loop()
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="structure")
+
+    op = scheduler.op if scheduler is not None else no_op
+    pending = deque()
+    count = 0
+    entries = parse_structure_async(lines, executor=executor)
+    try:
+        async for path, is_dir in entries:
+            for expanded in expand_braces(path):
+                full_path = os.path.join(base_path, expanded)
+                pending.append(loop.run_in_executor(executor, _create_entry, full_path, is_dir, op))
+                count += 1
+                if len(pending) >= max_pending:
+                    yield await pending.popleft()
+                while pending and pending[0].done():
+                    yield pending.popleft().result()
+                if count % max_pending == 0:
+                    # Long brace expansions must not monopolize the loop
+                    await asyncio.sleep(0)
+        while pending:
+            yield await pending.popleft()
+        if not count:
+            raise StructureParseError("No valid structure found")
+    finally:
+        for future in pending:
+            future.cancel()
+        await entries.aclose()
+        if own_executor:
+            _shutdown_now(executor)
+
+
+def _create_entry(full_path: str, is_dir: bool, op=no_op) -> Progress:
+    """Blocking creation of one entry; safe to run concurrently"""
+    with op():
+        return _create_entry_now(full_path, is_dir)
+
+
+def _create_entry_now(full_path: str, is_dir: bool) -> Progress:
+    if is_dir:
+        os.makedirs(full_path, exist_ok=True)
+        return Progress(full_path, True, "created")
+
+    full_path, spec = split_size_annotation(full_path)
+    dir_path = os.path.dirname(full_path)
+    if dir_path:
+        # exist_ok makes concurrent creation of shared parents safe
+        os.makedirs(dir_path, exist_ok=True)
+    try:
+        fd = os.open(full_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    except FileExistsError:
+        return Progress(full_path, False, "skipped")
+    try:
+        if spec is not None:
+            write_content(fd, spec)
+    finally:
+        os.close(fd)
+    return Progress(full_path, False, "created")
+
+
+def _next_batch(entries: Iterator[Tuple[str, bool]], size: int,
+                ready: Optional[Callable[[], bool]] = None) -> List[Tuple[str, bool]]:
+    """Parse up to size entries, ending early once ready() says the next line is not there yet"""
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= size or (ready is not None and not ready()):
+            break
+    return batch
+
+
+async def _pump_lines(lines: AsyncIterable[str], line_queue: "queue.Queue", cancelled: threading.Event) -> None:
+    """Move lines from an async source into the parser thread's queue"""
+    loop = asyncio.get_running_loop()
+    try:
+        async for line in lines:
+            if cancelled.is_set():
+                return
+            try:
+                line_queue.put_nowait(line)
+            except queue.Full:
+                # Back-pressure: wait in a thread rather than on the loop
+                await loop.run_in_executor(None, line_queue.put, line)
+    finally:
+        try:
+            line_queue.put_nowait(_END)
+        except queue.Full:
+            # A cancelled parser no longer drains the queue, so only wait for it otherwise
+            if not cancelled.is_set():
+                await loop.run_in_executor(None, line_queue.put, _END)
+
+
+def _drain_queue(line_queue: "queue.Queue", cancelled: threading.Event) -> Iterator[str]:
+    while not cancelled.is_set():
+        line = line_queue.get()
+        if line is _END:
+            return
+        yield line
+
+
+def _until_cancelled(lines: Iterable[str], cancelled: threading.Event) -> Iterator[str]:
+    for line in lines:
+        if cancelled.is_set():
+            return
+        yield line
+
+
+def _shutdown_now(executor: ThreadPoolExecutor) -> None:
+    try:
+        executor.shutdown(wait=False, cancel_futures=True)
+    except TypeError:
+        # Python 3.8 has no cancel_futures
+        executor.shutdown(wait=False)
@@ -0,0 +1,328 @@
+"""
+File content for Project Structure Creator
+
+Entries are zero-byte files unless their name carries a size annotation:
+
+    data.bin [64MB]             sparse file (ftruncate), the default
+    data.bin [1GiB alloc]       preallocated blocks (posix_fallocate)
+    data.bin [16MB fill]        written with the default byte pattern
+    data.bin [16MB fill=dead]   written with a hex byte pattern
+
+In JSON and YAML the same is written as a mapping, e.g.
+``{"data.bin": {"size": "64MB", "mode": "fill", "fill": "dead"}}``.
+
+Units follow util-linux conventions: ``KB``, ``MB``, ``GB``, ``TB`` are
+powers of 1000; ``K``/``KiB``, ``M``/``MiB``, ... are powers of 1024; ``B``
+is bytes. A unit is required, so names like ``photo [1]`` stay literal.
+"""
+
+import os
+import re
+from typing import Dict, NamedTuple, Optional, Tuple
+
+MODES = ("sparse", "alloc", "fill")
+
+# Pattern used by "fill" when none is given
+DEFAULT_PATTERN = b"\xa5"
+
+# Size of the reusable buffer used for pattern fills
+FILL_BUFFER_SIZE = 1 << 20
+
+_UNITS = {
+    "B": 1,
+    "KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3, "TB": 1000 ** 4, "PB": 1000 ** 5,
+    "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4, "P": 1024 ** 5,
+    "KIB": 1024, "MIB": 1024 ** 2, "GIB": 1024 ** 3, "TIB": 1024 ** 4, "PIB": 1024 ** 5,
+}
+
+_SIZE_ANNOTATION = re.compile(
+    r'\s*\[\s*(\d+(?:\.\d+)?)\s*([KMGTP](?:iB|B)?|B)\s*'
+    r'(?:[, ]\s*(sparse|alloc|fill)(?:\s*=\s*([0-9a-fA-F]+))?\s*)?\]$',
+    re.IGNORECASE
+)
+
+
+# A size string with an explicit unit, as accepted in JSON/YAML size mappings
+_SIZE_VALUE = re.compile(r'^\s*\d+(?:\.\d+)?\s*([A-Za-z]+)\s*$')
+
+
+class FileSpec(NamedTuple):
+    """Planned content of a file"""
+
+    size: int
+    mode: str = "sparse"
+    pattern: bytes = DEFAULT_PATTERN
+
+    @property
+    def writes_data(self) -> bool:
+        """True if creating the file writes or reserves real blocks"""
+        return self.size > 0 and self.mode != "sparse"
+
+
+def parse_size(text) -> int:
+    """
+    Convert a size such as ``64MB``, ``1.5GiB``, ``512B`` or an int to bytes.
+
+    Raises:
+        ValueError: If the size cannot be parsed
+    """
+    if isinstance(text, int):
+        if text < 0:
+            raise ValueError(f"Invalid size: {text}")
+        return text
+    match = re.match(r'^\s*(\d+(?:\.\d+)?)\s*([A-Za-z]*)\s*$', str(text))
+    if not match:
+        raise ValueError(f"Invalid size: {text!r}")
+    number, unit = match.groups()
+    factor = _UNITS.get(unit.upper() or "B")
+    if factor is None:
+        raise ValueError(f"Unknown size unit in {text!r}")
+    return int(float(number) * factor)
+
+
+def has_size_annotation(name: str) -> bool:
+    """Return True if name ends with a size annotation"""
+    return name.endswith(']') and _SIZE_ANNOTATION.search(name) is not None
+
+
+def split_size_annotation(name: str) -> Tuple[str, Optional[FileSpec]]:
+    """
+    Split a trailing size annotation off a name or path.
+
+    Returns:
+        (name without annotation, FileSpec), or (name, None) when the name
+        carries no annotation
+    """
+    if not name.endswith(']'):
+        return name, None
+    match = _SIZE_ANNOTATION.search(name)
+    if not match:
+        return name, None
+    number, unit, mode, pattern = match.groups()
+    spec = FileSpec(
+        size=parse_size(number + unit),
+        mode=(mode or "sparse").lower(),
+        pattern=bytes.fromhex(_even_hex(pattern)) if pattern else DEFAULT_PATTERN,
+    )
+    return name[:match.start()], spec
+
+
+def format_size_annotation(size, mode: Optional[str] = None, pattern: Optional[str] = None) -> str:
+    """
+    Build the annotation text for a JSON/YAML size mapping.
+
+    Raises:
+        ValueError: If the size or mode is invalid
+    """
+    size = parse_size(size)
+    mode = (mode or ("fill" if pattern else "sparse")).lower()
+    if mode not in MODES:
+        raise ValueError(f"Unknown file mode '{mode}' (choose from {', '.join(MODES)})")
+    if pattern:
+        bytes.fromhex(_even_hex(str(pattern)))
+        return f" [{size}B {mode}={pattern}]"
+    return f" [{size}B {mode}]"
+
+
+def is_size_mapping(value) -> bool:
+    """
+    Return True if a JSON/YAML value describes file content rather than a directory.
+
+    The size must be an int or a string with a size unit, so a directory that
+    merely contains an entry named "size" (``{"size": "small"}``) stays one.
+    """
+    if not isinstance(value, dict) or "size" not in value or not set(value) <= {"size", "mode", "fill"}:
+        return False
+    if not isinstance(value.get("mode", ""), str):
+        return False
+    size = value["size"]
+    if isinstance(size, bool):
+        return False
+    if isinstance(size, int):
+        return True
+    match = _SIZE_VALUE.match(size) if isinstance(size, str) else None
+    return match is not None and match.group(1).upper() in _UNITS
+
+
+def format_size(size: int) -> str:
+    """Human readable size for progress messages"""
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if value < 1024 or unit == "TiB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{size} B"
+
+
+def write_content(fd: int, spec: FileSpec) -> None:
+    """
+    Give a newly created, empty file its planned size and content.
+
+    Sparse files only have their length set. Preallocation uses
+    posix_fallocate, falling back to writing zeros where the platform or
+    file system does not support it. Pattern fills reuse one large buffer,
+    so multi-GB files are written in big sequential chunks.
+    """
+    if spec.size <= 0:
+        return
+    if spec.mode == "sparse":
+        os.ftruncate(fd, spec.size)
+        return
+    if spec.mode == "alloc":
+        fallocate = getattr(os, "posix_fallocate", None)
+        if fallocate is not None:
+            try:
+                fallocate(fd, 0, spec.size)
+                return
+            except OSError:
+                pass
+        _write_pattern(fd, spec.size, b"\0")
+        return
+    _write_pattern(fd, spec.size, spec.pattern)
+
+
+_FILL_BUFFERS: Dict[bytes, memoryview] = {}
+
+
+def _write_pattern(fd: int, size: int, pattern: bytes) -> None:
+    buffer = _FILL_BUFFERS.get(pattern)
+    if buffer is None:
+        # A whole number of pattern periods, so chunks continue seamlessly
+        buffer = memoryview(pattern * max(1, FILL_BUFFER_SIZE // len(pattern)))
+        if len(_FILL_BUFFERS) < 16:
+            _FILL_BUFFERS[pattern] = buffer
+
+    remaining = size
+    period = len(pattern)
+    while remaining > 0:
+        # Resume mid-pattern if a previous write was partial
+        offset = (size - remaining) % period
+        written = os.write(fd, buffer[offset:offset + remaining])
+        remaining -= written
+
+
+def _even_hex(text: str) -> str:
+    return text if len(text) % 2 == 0 else "0" + text
+
+
+def planned_writes(spec: FileSpec) -> int:
+    """Number of write-type system calls write_content issues for spec"""
+    if not spec.writes_data:
+        return 0
+    if spec.mode == "alloc" and hasattr(os, "posix_fallocate"):
+        return 1
+    return -(-spec.size // FILL_BUFFER_SIZE)
+
+
+# Linux ioctl that shares extents between two files (btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+
+DEDUP_METHODS = ("hardlink", "reflink")
+
+# Outcomes of Deduplicator.link
+LINKED = "linked"
+COPIED = "copied"
+EXISTS = "exists"
+
+
+class Deduplicator:
+    """
+    Write each distinct planned file content once and link the duplicates.
+
+    The content of a generated file is fully described by its FileSpec, so
+    the spec itself is the content key. The first file with a given spec is
+    written normally; later ones become hardlinks or reflinks of it. Where
+    linking is not possible (another file system, too many links, no
+    reflink support) the file is written normally instead and becomes the
+    source for the next duplicates.
+
+    Hardlinked files share one inode: writing to one changes all of them.
+    Reflinks share blocks copy-on-write and stay independent.
+    """
+
+    def __init__(self, method: str = "hardlink"):
+        if method not in DEDUP_METHODS:
+            raise ValueError(f"Unknown dedup method '{method}' (choose from {', '.join(DEDUP_METHODS)})")
+        self.method = method
+        self.sources: Dict[FileSpec, str] = {}
+        self.linked = 0
+        self.bytes_saved = 0
+        self.writes_saved = 0
+        self._reflink_supported = method == "reflink" and _has_ficlone()
+
+    def applies_to(self, spec: Optional[FileSpec]) -> bool:
+        """True if files with this spec are worth deduplicating"""
+        return spec is not None and spec.writes_data
+
+    def remember(self, spec: FileSpec, path: str) -> None:
+        """Record a normally written file as the link source for its content"""
+        self.sources[spec] = path
+
+    def link(self, path: str, spec: FileSpec) -> Optional[str]:
+        """
+        Try to create path as a link to an earlier file with the same content.
+
+        Returns:
+            LINKED if the file was linked, COPIED if a failed reflink was
+            completed as a normal write, EXISTS if path already exists, or
+            None if the caller should write the file normally
+        """
+        source = self.sources.get(spec)
+        if source is None:
+            return None
+        if self.method == "hardlink":
+            try:
+                os.link(source, path)
+            except FileExistsError:
+                return EXISTS
+            except OSError:
+                return None
+        else:
+            if not self._reflink_supported:
+                return None
+            outcome = self._reflink(source, path, spec)
+            if outcome != LINKED:
+                return outcome
+
+        self.linked += 1
+        self.bytes_saved += spec.size
+        self.writes_saved += planned_writes(spec)
+        return LINKED
+
+    def _reflink(self, source: str, path: str, spec: FileSpec) -> Optional[str]:
+        import fcntl
+
+        try:
+            src_fd = os.open(source, os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            try:
+                dst_fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            except FileExistsError:
+                return EXISTS
+            try:
+                fcntl.ioctl(dst_fd, FICLONE, src_fd)
+                return LINKED
+            except OSError:
+                # File system cannot share extents: stop trying and copy instead
+                self._reflink_supported = False
+                write_content(dst_fd, spec)
+                return COPIED
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+
+    def format_report(self) -> str:
+        """Summary of the space and writes saved"""
+        return (f"♻️  Deduplicated {self.linked} files via {self.method}s: "
+                f"saved {format_size(self.bytes_saved)} and {self.writes_saved} writes")
+
+
+def _has_ficlone() -> bool:
+    try:
+        import fcntl  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,184 @@
+"""
+Warm daemon mode for Project Structure Creator
+
+``serve`` keeps one process with everything imported and initialised
+listening on a local Unix socket. Clients forward the spec and target
+directory and print the results streamed back, so build scripts do not pay
+for imports on every call. The ``project-structure-client`` command
+(project_structure_client.py) imports nothing from this package and is the
+cheapest way to call the daemon; ``--connect`` does the same from the full
+CLI, with its options such as --markdown.
+
+Protocol (one connection per request, newline separated):
+    client -> server: one UTF-8 JSON header line, e.g. {"target": "/abs/dir"},
+                      then the spec, plain UTF-8 text or gzip/bzip2/xz
+                      compressed, until the client shuts down its write side
+    server -> client: JSON lines {"log": message} while entries are created,
+                      then {"ok": true, "count": n} or {"ok": false, "error": text}
+"""
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from project_structure_client import default_socket_path, request
+
+from .main import create_structure_stream, parse_structure
+from .sources import read_stream_lines
+from .throttle import OpScheduler
+
+# Messages are flushed to the client in groups of this size
+_FLUSH_EVERY = 64
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handle one create request"""
+
+    def handle(self):
+        sent = [0]
+
+        def send(message: dict) -> None:
+            self.wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+            sent[0] += 1
+            if sent[0] % _FLUSH_EVERY == 0:
+                self.wfile.flush()
+
+        first = self.rfile.readline()
+        if not first:
+            # Connection without a request, e.g. a liveness probe
+            return
+        
+        try:
+            try:
+                header = json.loads(first)
+                target = header.get("target")
+                if not target or not os.path.isabs(target):
+                    raise ValueError("Request must name an absolute target directory")
+                lines = read_stream_lines(self.rfile)
+                count = create_structure_stream(
+                    target, lines,
+                    log=lambda message: send({"log": message}),
+                    dedup=header.get("dedup"),
+                    scheduler=self.server.scheduler,
+                )
+                send({"ok": True, "count": count})
+            except (BrokenPipeError, ConnectionResetError):
+                raise
+            except Exception as e:
+                send({"ok": False, "error": str(e)})
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away; nothing left to report to
+            pass
+
+
+class _PooledUnixServer(socketserver.UnixStreamServer):
+    """Unix socket server that handles connections on a fixed worker pool"""
+
+    def __init__(self, socket_path: str, workers: int, scheduler: Optional[OpScheduler] = None):
+        self.scheduler = scheduler
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="structure-daemon")
+        super().__init__(socket_path, _RequestHandler)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def serve(socket_path: Optional[str] = None, workers: int = 4,
+          scheduler: Optional[OpScheduler] = None) -> None:
+    """
+    Run the daemon until interrupted.
+
+    Args:
+        socket_path: Unix socket to listen on (default: default_socket_path())
+        workers: Number of requests handled concurrently
+        scheduler: Optional OpScheduler shared by all requests
+
+    Raises:
+        OSError: If Unix sockets are unavailable or another daemon owns the socket
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Daemon mode requires Unix domain sockets")
+    socket_path = socket_path or default_socket_path()
+    _remove_stale_socket(socket_path)
+
+    # Warm up lazily imported parser dependencies and regex caches before the first request
+    parse_structure(["warmup/", "    file.txt"])
+    parse_structure(['{"warmup": ["file.txt"]}'])
+
+    old_umask = os.umask(0o077)
+    try:
+        server = _PooledUnixServer(socket_path, workers, scheduler)
+    finally:
+        os.umask(old_umask)
+
+    if threading.current_thread() is threading.main_thread():
+        # Stop cleanly (and remove the socket) on SIGTERM as well as Ctrl+C
+        signal.signal(signal.SIGTERM, _interrupt)
+
+    print(f"Listening on {socket_path} with {workers} workers (Ctrl+C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+def run_client(socket_path: str, lines: Iterable[str], target: str,
+               dedup: Optional[str] = None, out=None) -> int:
+    """
+    Forward a create request to a running daemon and print its output.
+
+    Returns:
+        Number of entries processed
+
+    Raises:
+        ConnectionError: If the daemon cannot be reached or reports an error
+    """
+    def write_lines(sock):
+        with sock.makefile("wb") as writer:
+            for line in lines:
+                writer.write(line.encode("utf-8") + b"\n")
+
+    return request(socket_path, target, write_lines, dedup, out)
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """Delete a leftover socket file, refusing if a daemon still answers on it"""
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+        return
+    finally:
+        probe.close()
+    raise OSError(f"A daemon is already listening on {socket_path}")
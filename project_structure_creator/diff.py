@@ -0,0 +1,193 @@
+"""
+Structure comparison for Project Structure Creator
+
+Compares and merges parsed structures without touching the file system.
+Both operations index entries by normalized path in a dict, so they run in
+O(n) regardless of input order or format.
+"""
+
+import json
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+from .render import normalize_path, render_structure
+
+Entry = Tuple[str, bool]
+
+
+class StructureDiff(NamedTuple):
+    """Differences between two parsed structures"""
+
+    added: List[Entry]
+    removed: List[Entry]
+    type_changed: List[Tuple[str, bool, bool]]  # (path, old_is_dir, new_is_dir)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.type_changed)
+
+
+def index_entries(entries: Iterable[Entry]) -> "OrderedDict[str, bool]":
+    """
+    Index entries by normalized path, keeping first-seen order.
+
+    Parent directories that are only implied by a deeper path are indexed
+    too, and a path listed both as a file and as a directory counts as a
+    directory, matching what create_structure ends up with on disk.
+    """
+    index: Dict[str, bool] = OrderedDict()
+    for path, is_dir in entries:
+        key = normalize_path(path)
+        if not key:
+            continue
+        # Every indexed path has its ancestors indexed, so stop at the first hit
+        missing = []
+        parent = key.rpartition("/")[0]
+        while parent and parent not in index:
+            missing.append(parent)
+            parent = parent.rpartition("/")[0]
+        for parent in reversed(missing):
+            index[parent] = True
+        index[key] = index.get(key, False) or is_dir
+    return index
+
+
+def diff_structures(old: Iterable[Entry], new: Iterable[Entry]) -> StructureDiff:
+    """
+    Compute added, removed and type-changed paths between two structures.
+
+    Args:
+        old: Entries of the base structure
+        new: Entries of the changed structure
+
+    Returns:
+        StructureDiff with added and type-changed paths in the order of
+        ``new`` and removed paths in the order of ``old``
+    """
+    return diff_indexes(index_entries(old), index_entries(new))
+
+
+def diff_indexes(old_index: Dict[str, bool], new_index: Dict[str, bool]) -> StructureDiff:
+    """
+    Compute a StructureDiff from two indexes built by index_entries.
+
+    Lets callers that keep an index around (e.g. watch mode) skip
+    re-indexing the unchanged side.
+    """
+    added = []
+    type_changed = []
+    for path, is_dir in new_index.items():
+        old_is_dir = old_index.get(path)
+        if old_is_dir is None:
+            added.append((path, is_dir))
+        elif old_is_dir != is_dir:
+            type_changed.append((path, old_is_dir, is_dir))
+
+    removed = [(path, is_dir) for path, is_dir in old_index.items() if path not in new_index]
+    return StructureDiff(added, removed, type_changed)
+
+
+def merge_structures(base: Iterable[Entry], other: Iterable[Entry], prefer: str = "other") -> List[Entry]:
+    """
+    Merge two structures into one containing every path from both.
+
+    Args:
+        base: Entries of the first structure; their order is kept
+        other: Entries of the second structure; new paths are appended
+        prefer: Which side decides file vs directory on conflicts,
+            ``"base"`` or ``"other"``. A path with entries beneath it in
+            the merged structure stays a directory either way.
+
+    Returns:
+        Merged list of (path, is_directory) tuples
+
+    Raises:
+        ValueError: If prefer is not ``"base"`` or ``"other"``
+    """
+    if prefer not in ("base", "other"):
+        raise ValueError("prefer must be 'base' or 'other'")
+
+    merged = index_entries(base)
+    for path, is_dir in index_entries(other).items():
+        if path not in merged or prefer == "other":
+            merged[path] = is_dir
+    # A file cannot have children: keep a directory wherever entries lie beneath it
+    for path in merged:
+        parent = path.rpartition("/")[0]
+        if parent:
+            merged[parent] = True
+    return list(merged.items())
+
+
+def render_diff(diff: StructureDiff, fmt: str = "tree") -> Iterator[str]:
+    """
+    Render a StructureDiff in one of the supported output formats.
+
+    JSON and YAML produce a single document with ``added``, ``removed`` and
+    ``type_changed`` keys; the line-based formats print one titled section
+    per non-empty category, and ``flat`` prefixes each path with +, - or ~.
+    """
+    changed = [
+        {"path": path, "old": _kind(old_is_dir), "new": _kind(new_is_dir)}
+        for path, old_is_dir, new_is_dir in diff.type_changed
+    ]
+
+    if fmt == "flat":
+        for path, is_dir in diff.added:
+            yield f"+ {path}{'/' if is_dir else ''}"
+        for path, is_dir in diff.removed:
+            yield f"- {path}{'/' if is_dir else ''}"
+        for item in changed:
+            yield f"~ {item['path']} ({item['old']} -> {item['new']})"
+        return
+
+    if fmt in ("json", "yaml"):
+        document = OrderedDict([
+            ("added", json.loads("\n".join(render_structure(diff.added, "json")))),
+            ("removed", json.loads("\n".join(render_structure(diff.removed, "json")))),
+            ("type_changed", changed),
+        ])
+        if fmt == "json":
+            yield from json.dumps(document, indent=2, ensure_ascii=False).split("\n")
+        else:
+            yield from _yaml_lines(document, 0)
+        return
+
+    sections = [("Added", diff.added), ("Removed", diff.removed)]
+    first = True
+    for title, entries in sections:
+        if not entries:
+            continue
+        if not first:
+            yield ""
+        first = False
+        yield f"# {title} ({len(entries)})"
+        yield from render_structure(entries, fmt)
+    if changed:
+        if not first:
+            yield ""
+        yield f"# Type changed ({len(changed)})"
+        for item in changed:
+            yield f"{item['path']} ({item['old']} -> {item['new']})"
+
+
+def _kind(is_dir: bool) -> str:
+    return "directory" if is_dir else "file"
+
+
+def _yaml_lines(value, depth) -> Iterator[str]:
+    """Emit a JSON-compatible value as block YAML"""
+    indent = "  " * depth
+    if isinstance(value, dict):
+        for key, item in value.items():
+            key = json.dumps(key, ensure_ascii=False)
+            if isinstance(item, (dict, list)) and item:
+                yield f"{indent}{key}:"
+                yield from _yaml_lines(item, depth + 1)
+            else:
+                yield f"{indent}{key}: {json.dumps(item, ensure_ascii=False)}"
+    else:
+        for item in value:
+            lines = list(_yaml_lines(item, depth + 1))
+            yield f"{indent}- {lines[0].lstrip()}"
+            yield from lines[1:]
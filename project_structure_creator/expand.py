@@ -0,0 +1,177 @@
+"""
+Brace and range expansion for Project Structure Creator
+
+Names in any input format may contain shell-style brace groups:
+
+    part_{a,b,c}.dat        -> part_a.dat, part_b.dat, part_c.dat
+    shard_{000..999}        -> shard_000 ... shard_999 (zero padding kept)
+    run_{1..10..3}          -> run_1, run_4, run_7, run_10
+    grid_{a..c}{1,2}        -> grid_a1, grid_a2, grid_b1, ... grid_c2
+
+Parsed entries keep the compact pattern; expansion happens lazily while the
+structure is created, so a short spec can describe millions of entries
+without ever holding them in memory. Braces that contain neither a comma
+nor a valid range are left as literal text, as in bash.
+"""
+
+import re
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+_NUMERIC_RANGE = re.compile(r'^(-?\d+)\.\.(-?\d+)(?:\.\.(-?\d+))?$')
+_CHAR_RANGE = re.compile(r'^([a-zA-Z])\.\.([a-zA-Z])(?:\.\.(-?\d+))?$')
+
+
+def expand_braces(text: str) -> Iterator[str]:
+    """
+    Lazily yield every expansion of text, left to right.
+
+    Args:
+        text: Name or path possibly containing brace groups
+
+    Yields:
+        Expanded strings; text itself when it has no brace groups
+    """
+    if '{' not in text:
+        yield text
+        return
+    group = _find_group(text)
+    if group is None:
+        yield text
+        return
+
+    start, end, alternatives = group
+    prefix, suffix = text[:start], text[end + 1:]
+    for alternative in alternatives:
+        for head in expand_braces(alternative):
+            for tail in expand_braces(suffix):
+                yield prefix + head + tail
+
+
+def count_expansions(text: str) -> int:
+    """Return how many strings expand_braces(text) yields, without expanding"""
+    if '{' not in text:
+        return 1
+    group = _find_group(text)
+    if group is None:
+        return 1
+
+    start, end, alternatives = group
+    if isinstance(alternatives, _Formatted):
+        heads = len(alternatives.values)
+    else:
+        heads = sum(count_expansions(alternative) for alternative in alternatives)
+    return heads * count_expansions(text[end + 1:])
+
+
+def first_expansion(text: str) -> str:
+    """Return the first expansion of text, e.g. for file/directory classification"""
+    return next(expand_braces(text), text)
+
+
+def expand_entries(entries: Iterable[Tuple[str, bool]]) -> Iterator[Tuple[str, bool]]:
+    """Lazily expand brace groups in the paths of parsed entries"""
+    for path, is_dir in entries:
+        if '{' in path:
+            for expanded in expand_braces(path):
+                yield expanded, is_dir
+        else:
+            yield path, is_dir
+
+
+class _Formatted:
+    """Lazy sequence of formatted range values"""
+
+    __slots__ = ("values", "fmt")
+
+    def __init__(self, values: range, fmt):
+        self.values = values
+        self.fmt = fmt
+
+    def __iter__(self):
+        fmt = self.fmt
+        for value in self.values:
+            yield fmt(value)
+
+
+def _find_group(text: str) -> Optional[Tuple[int, int, Iterable[str]]]:
+    """Locate the leftmost expandable group as (start, end, alternatives)"""
+    search = 0
+    while True:
+        start = text.find('{', search)
+        if start < 0:
+            return None
+        end = _matching_brace(text, start)
+        if end < 0:
+            return None
+        alternatives = _alternatives(text[start + 1:end])
+        if alternatives is not None:
+            return start, end, alternatives
+        search = start + 1
+
+
+def _matching_brace(text: str, start: int) -> int:
+    depth = 0
+    for i in range(start, len(text)):
+        char = text[i]
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+def _alternatives(body: str):
+    """Return the alternatives of a group body, or None if it is literal text"""
+    match = _NUMERIC_RANGE.match(body)
+    if match:
+        first, last, step = match.groups()
+        values = _inclusive_range(int(first), int(last), step)
+        width = max(_padded_width(first), _padded_width(last))
+        if width:
+            return _Formatted(values, lambda value: f"{value:0{width}d}")
+        return _Formatted(values, str)
+
+    match = _CHAR_RANGE.match(body)
+    if match:
+        first, last, step = match.groups()
+        return _Formatted(_inclusive_range(ord(first), ord(last), step), chr)
+
+    parts = _split_top_level(body)
+    if len(parts) > 1:
+        return parts
+    return None
+
+
+def _inclusive_range(first: int, last: int, step: Optional[str]) -> range:
+    step = abs(int(step)) if step else 1
+    step = step or 1
+    if first <= last:
+        return range(first, last + 1, step)
+    return range(first, last - 1, -step)
+
+
+def _padded_width(number: str) -> int:
+    """Width to zero-pad to when an endpoint is written with leading zeros"""
+    digits = number.lstrip('-')
+    if len(digits) > 1 and digits.startswith('0'):
+        return len(number)
+    return 0
+
+
+def _split_top_level(body: str) -> List[str]:
+    """Split a group body at commas that are not inside nested braces"""
+    parts = []
+    depth = 0
+    current = 0
+    for i, char in enumerate(body):
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(body[current:i])
+            current = i + 1
+    parts.append(body[current:])
+    return parts
@@ -9,7 +9,19 @@ import sys
 from pathlib import Path
 
 # Import the main functionality
-from .main import parse_structure, create_structure, validate_structure_input, StructureParseError
+from .main import (parse_structure, create_structure, create_structure_stream, iter_structure,
+                   read_structure_lines, validate_structure_input, StructureParseError)
+from .expand import count_expansions
+from .sources import detect_compression, index_lines, read_line_block
+
+# Files larger than this are not loaded into the editor but shown page by page
+LARGE_FILE_THRESHOLD = 1 << 20
+# Lines per page of a file-backed view
+PAGE_LINES = 500
+# Entries listed in the preview of a file-backed structure
+PREVIEW_LIMIT = 2000
+# Progress messages between status bar refreshes while generating
+PROGRESS_EVERY = 5000
 
 
 class ProjectStructureGUI:
@@ -23,6 +35,13 @@ class ProjectStructureGUI:
         self.root.grid_rowconfigure(1, weight=1)
         self.root.grid_columnconfigure(0, weight=1)
         
+        # Path of a large structure file shown read-only, page by page
+        self.backing_file = None
+        self.backing_lines = 0
+        # Byte offset of the first line of each page
+        self.page_offsets = [0]
+        self.page = 0
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -72,6 +91,16 @@ class ProjectStructureGUI:
         self.text_input.grid(row=1, column=0, sticky="nsew")
         input_frame.grid_rowconfigure(1, weight=1)
         
+        # Paging controls, only shown for file-backed input
+        self.page_frame = ttk.Frame(input_frame)
+        self.page_frame.grid(row=2, column=0, sticky="ew", pady=(5, 0))
+        self.page_frame.grid_columnconfigure(2, weight=1)
+        ttk.Button(self.page_frame, text="◀ Previous", command=lambda: self.show_page(self.page - 1)).grid(row=0, column=0)
+        ttk.Button(self.page_frame, text="Next ▶", command=lambda: self.show_page(self.page + 1)).grid(row=0, column=1, padx=(5, 0))
+        self.page_var = tk.StringVar()
+        ttk.Label(self.page_frame, textvariable=self.page_var).grid(row=0, column=2, sticky="w", padx=(10, 0))
+        self.page_frame.grid_remove()
+        
         # Add example text
         example_text = """Supported formats:
 
@@ -158,25 +187,113 @@ project/
         """Load structure from a text file"""
         file_path = filedialog.askopenfilename(
             title="Select Structure File",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+            filetypes=[("Text files", "*.txt"), ("Compressed", "*.gz *.bz2 *.xz"), ("All files", "*.*")]
         )
         if file_path:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                with open(file_path, 'rb') as f:
+                    compressed = detect_compression(f.read(8)) is not None
+                # Compressed specs may expand to any size, so they are never loaded whole
+                if compressed or os.path.getsize(file_path) > LARGE_FILE_THRESHOLD:
+                    self.open_file_backed(file_path)
+                    return
+                content = '\n'.join(read_structure_lines(file_path))
+                self.close_file_backed()
                 self.text_input.delete("1.0", tk.END)
                 self.text_input.insert("1.0", content)
                 self.status_var.set(f"Loaded: {os.path.basename(file_path)}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load file: {e}")
                 
+    def open_file_backed(self, file_path):
+        """Show a large file read-only, page by page, and use it directly as input"""
+        self.status_var.set(f"Indexing {os.path.basename(file_path)}...")
+        self.root.update_idletasks()
+        self.backing_lines, self.page_offsets = index_lines(file_path, PAGE_LINES)
+        self.backing_file = file_path
+        self.page_frame.grid()
+        self.show_page(0)
+        self.status_var.set(f"Loaded: {os.path.basename(file_path)} "
+                            f"({self.backing_lines:,} lines, read-only, parsed straight from the file)")
+        
+    def close_file_backed(self):
+        """Return to editing text in the input area"""
+        if self.backing_file is None:
+            return
+        self.backing_file = None
+        self.page_frame.grid_remove()
+        self.text_input.config(state=tk.NORMAL)
+        
+    def show_page(self, page):
+        """Display one page of the file-backed input"""
+        if self.backing_file is None:
+            return
+        pages = max(1, -(-self.backing_lines // PAGE_LINES))
+        self.page = max(0, min(page, pages - 1))
+        start = self.page * PAGE_LINES
+        lines = read_line_block(self.backing_file, self.page_offsets[self.page], PAGE_LINES)
+        
+        self.text_input.config(state=tk.NORMAL)
+        self.text_input.delete("1.0", tk.END)
+        self.text_input.insert("1.0", '\n'.join(lines))
+        self.text_input.config(state=tk.DISABLED)
+        self.page_var.set(f"{os.path.basename(self.backing_file)} (read-only): "
+                          f"lines {start + 1:,}–{min(start + PAGE_LINES, self.backing_lines):,} "
+                          f"of {self.backing_lines:,}, page {self.page + 1} of {pages}")
+        
+    def scan_backing_file(self, keep=0):
+        """
+        Parse the file-backed input as a stream.
+        
+        Returns:
+            Tuple (first path, directory count, file count, first ``keep`` entries)
+        """
+        first_path = None
+        dirs = files = 0
+        kept = []
+        for path, is_dir in iter_structure(read_structure_lines(self.backing_file)):
+            if first_path is None:
+                first_path = path
+            if len(kept) < keep:
+                kept.append((path, is_dir))
+            if is_dir:
+                dirs += count_expansions(path)
+            else:
+                files += count_expansions(path)
+        if first_path is None:
+            raise StructureParseError("No valid structure found")
+        return first_path, dirs, files, kept
+        
+    def make_progress_log(self, total):
+        """Log callback refreshing the status bar while a large structure is created"""
+        done = [0]
+        
+        def log(message):
+            done[0] += 1
+            if done[0] % PROGRESS_EVERY == 0:
+                self.status_var.set(f"Generating structure... {done[0]:,} of {total:,} entries")
+                self.root.update()
+        return log
+        
     def clear_input(self):
         """Clear the input text area"""
+        self.close_file_backed()
         self.text_input.delete("1.0", tk.END)
         self.status_var.set("Input cleared")
         
     def validate_input(self):
         """Validate the current input"""
+        if self.backing_file is not None:
+            try:
+                _, dirs, files, _ = self.scan_backing_file()
+            except Exception as e:
+                messagebox.showerror("Validation Error", f"❌ Invalid structure format:\n\n{e}")
+                self.status_var.set("Validation failed")
+                return
+            messagebox.showinfo("Validation", f"✅ Structure format is valid!\n\n{dirs:,} directories, {files:,} files")
+            self.status_var.set("Structure validated successfully")
+            return
+        
         lines = self.get_structure_lines()
         if not lines:
             messagebox.showwarning("Warning", "Please enter a project structure to validate")
@@ -203,6 +320,9 @@ project/
         
     def preview_structure(self):
         """Preview the structure that will be created"""
+        if self.backing_file is not None:
+            self.preview_backing_file()
+            return
         try:
             lines = self.get_structure_lines()
             if not lines:
@@ -236,55 +356,78 @@ project/
                 project_path = os.path.join(output_dir, root_folder) if output_dir else root_folder
             else:
                 project_path = output_dir or "output_project"
-                
-            # Create preview window
-            preview_window = tk.Toplevel(self.root)
-            preview_window.title("Structure Preview")
-            preview_window.geometry("600x500")
-            preview_window.transient(self.root)
-            preview_window.grab_set()
-            
-            # Preview text
-            preview_text = scrolledtext.ScrolledText(
-                preview_window, 
-                wrap=tk.WORD,
-                font=("Consolas", 10)
-            )
-            preview_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-            
+
             preview_content = f"📍 Project will be created at:\n{project_path}\n\n"
             preview_content += f"📊 Summary: {len([p for p in paths if p[1]])} directories, {len([p for p in paths if not p[1]])} files\n\n"
             preview_content += "📁 Structure preview:\n\n"
-            
-            # Build tree representation
-            for i, (path, is_dir) in enumerate(paths):
-                icon = "📁" if is_dir else "📄"
-                # Add proper indentation based on path depth
-                depth = path.count(os.sep)
-                indent = "  " * depth
-                name = os.path.basename(path) if os.sep in path else path
-                preview_content += f"{indent}{icon} {name}\n"
-                
-            preview_text.insert("1.0", preview_content)
-            preview_text.config(state=tk.DISABLED)
-            
-            # Add close button
-            close_btn = ttk.Button(
-                preview_window, 
-                text="Close", 
-                command=preview_window.destroy
-            )
-            close_btn.pack(pady=5)
+            preview_content += self.format_preview_entries(paths)
+            self.show_preview_window(preview_content)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to preview structure: {e}")
             self.status_var.set("Preview failed")
             
+    def preview_backing_file(self):
+        """Preview a file-backed structure from a streamed parse"""
+        try:
+            first_path, dirs, files, paths = self.scan_backing_file(keep=PREVIEW_LIMIT)
+        except Exception as e:
+            messagebox.showerror("Parse Error", f"Failed to parse structure:\n\n{e}")
+            return
+        output_dir = self.output_path.get()
+        root_folder = first_path.split(os.sep)[0]
+        project_path = os.path.join(output_dir, root_folder) if output_dir else root_folder
+        
+        preview_content = f"📍 Project will be created at:\n{project_path}\n\n"
+        preview_content += f"📊 Summary: {dirs:,} directories, {files:,} files\n\n"
+        preview_content += f"📁 Structure preview (first {len(paths):,} entries):\n\n"
+        preview_content += self.format_preview_entries(paths)
+        self.show_preview_window(preview_content)
+        
+    def format_preview_entries(self, paths):
+        """Indented listing of entries for the preview window"""
+        lines = []
+        for path, is_dir in paths:
+            icon = "📁" if is_dir else "📄"
+            # Add proper indentation based on path depth
+            depth = path.count(os.sep)
+            indent = "  " * depth
+            name = os.path.basename(path) if os.sep in path else path
+            lines.append(f"{indent}{icon} {name}\n")
+        return "".join(lines)
+        
+    def show_preview_window(self, preview_content):
+        """Open the read-only preview window"""
+        preview_window = tk.Toplevel(self.root)
+        preview_window.title("Structure Preview")
+        preview_window.geometry("600x500")
+        preview_window.transient(self.root)
+        preview_window.grab_set()
+        
+        # Preview text
+        preview_text = scrolledtext.ScrolledText(
+            preview_window, 
+            wrap=tk.WORD,
+            font=("Consolas", 10)
+        )
+        preview_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        preview_text.insert("1.0", preview_content)
+        preview_text.config(state=tk.DISABLED)
+        
+        # Add close button
+        close_btn = ttk.Button(
+            preview_window, 
+            text="Close", 
+            command=preview_window.destroy
+        )
+        close_btn.pack(pady=5)
+            
     def generate_structure(self):
         """Generate the project structure"""
         try:
-            lines = self.get_structure_lines()
-            if not lines:
+            file_backed = self.backing_file is not None
+            lines = None if file_backed else self.get_structure_lines()
+            if not file_backed and not lines:
                 messagebox.showwarning("Warning", "Please enter a project structure")
                 return
                 
@@ -293,27 +436,40 @@ project/
                 messagebox.showwarning("Warning", "Please specify an output directory")
                 return
                 
-            # Validate input first
-            is_valid, error_msg = validate_structure_input(lines)
-            if not is_valid:
-                messagebox.showerror("Validation Error", f"Invalid structure format:\n\n{error_msg}")
-                return
-                
-            try:
-                paths = parse_structure(lines)
-            except StructureParseError as e:
-                messagebox.showerror("Parse Error", f"Failed to parse structure:\n\n{e}")
-                return
-            except Exception as e:
-                messagebox.showerror("Parse Error", f"Unexpected parsing error:\n\n{e}")
-                return
-                
-            if not paths:
-                messagebox.showwarning("Warning", "No valid structure found. Please check your input format.")
-                return
+            if file_backed:
+                # Parsed straight from the file; the text never passes through the widget
+                self.status_var.set("Parsing structure...")
+                self.root.update()
+                try:
+                    first_path, dir_count, file_count, _ = self.scan_backing_file()
+                except Exception as e:
+                    messagebox.showerror("Parse Error", f"Failed to parse structure:\n\n{e}")
+                    self.status_var.set("Parse failed")
+                    return
+            else:
+                # Validate input first
+                is_valid, error_msg = validate_structure_input(lines)
+                if not is_valid:
+                    messagebox.showerror("Validation Error", f"Invalid structure format:\n\n{error_msg}")
+                    return
+                    
+                try:
+                    paths = parse_structure(lines)
+                except StructureParseError as e:
+                    messagebox.showerror("Parse Error", f"Failed to parse structure:\n\n{e}")
+                    return
+                except Exception as e:
+                    messagebox.showerror("Parse Error", f"Unexpected parsing error:\n\n{e}")
+                    return
+                    
+                if not paths:
+                    messagebox.showwarning("Warning", "No valid structure found. Please check your input format.")
+                    return
+                first_path = paths[0][0]
+                dir_count = len([p for p in paths if p[1]])
+                file_count = len([p for p in paths if not p[1]])
                 
             # Get the root folder name from the first path
-            first_path = paths[0][0]
             root_folder = first_path.split(os.sep)[0] if os.sep in first_path else first_path
             project_path = os.path.join(output_dir, root_folder)
             
@@ -329,7 +485,7 @@ project/
                 # Confirm the creation location
                 result = messagebox.askyesno(
                     "Confirm Creation", 
-                    f"Create project structure at:\n{project_path}\n\nThis will create {len([p for p in paths if p[1]])} directories and {len([p for p in paths if not p[1]])} files."
+                    f"Create project structure at:\n{project_path}\n\nThis will create {dir_count:,} directories and {file_count:,} files."
                 )
                 if not result:
                     return
@@ -338,7 +494,11 @@ project/
             self.root.update()
             
             try:
-                create_structure(output_dir, lines)
+                if file_backed:
+                    create_structure_stream(output_dir, read_structure_lines(self.backing_file),
+                                            log=self.make_progress_log(dir_count + file_count))
+                else:
+                    create_structure(output_dir, lines)
                 self.status_var.set(f"✅ Structure created successfully at: {project_path}")
                 
                 # Ask if user wants to open the directory
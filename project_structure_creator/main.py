@@ -5,7 +5,18 @@ Main module for Project Structure Creator
 import os
 import sys
 import re
-from typing import List, Tuple
+from collections import OrderedDict, deque
+from functools import lru_cache
+from itertools import chain
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from . import stats
+from .content import (COPIED, DEDUP_METHODS, LINKED, Deduplicator, FileSpec, format_size, format_size_annotation,
+                      has_size_annotation, is_size_mapping, split_size_annotation, write_content)
+from .expand import expand_entries, first_expansion
+from .render import OUTPUT_FORMATS, render_structure_stream
+from .sources import read_lines, read_stream_lines
+from .throttle import OpScheduler, no_op
 
 
 class StructureParseError(Exception):
@@ -30,8 +41,9 @@ def parse_structure(lines: List[str]) -> List[Tuple[str, bool]]:
     if not lines or all(not line.strip() for line in lines):
         raise StructureParseError("No valid input provided")
     
-    # Clean and filter lines
-    clean_lines = [line.rstrip() for line in lines if line.strip()]
+    with stats.phase('detect'):
+        # Clean and filter lines
+        clean_lines = [line.rstrip() for line in lines if line.strip()]
     
     try:
         import json
@@ -43,11 +55,11 @@ def parse_structure(lines: List[str]) -> List[Tuple[str, bool]]:
     except ImportError:
         yaml = None
 
-    stack = []
-    paths = []
-    
     # Join all lines to detect format
-    joined = '\n'.join(clean_lines).strip()
+    with stats.phase('detect'):
+        joined = '\n'.join(clean_lines).strip()
+        # Line formats are told apart from the first lines only, as iter_structure does
+        head = clean_lines[:DETECT_LINES]
     
     # Try JSON format
     if json and (joined.startswith('{') or joined.startswith('[')):
@@ -57,7 +69,7 @@ def parse_structure(lines: List[str]) -> List[Tuple[str, bool]]:
             raise StructureParseError(f"Invalid JSON format: {e}")
     
     # Try YAML format
-    if yaml and (':' in joined and not any(line.strip().startswith('├') or line.strip().startswith('└') for line in clean_lines)):
+    if yaml and _looks_like_yaml(head):
         try:
             return _parse_yaml_structure(joined, yaml)
         except Exception as e:
@@ -65,14 +77,16 @@ def parse_structure(lines: List[str]) -> List[Tuple[str, bool]]:
             pass
     
     # Try Markdown list format
-    if any(re.match(r'^\s*[-*+]\s+', line) for line in clean_lines):
+    with stats.phase('detect'):
+        parser = _detect_line_parser(head)
+    if parser is _iter_markdown_structure:
         try:
             return _parse_markdown_structure(clean_lines)
         except Exception as e:
             raise StructureParseError(f"Invalid Markdown list format: {e}")
     
     # Try filesystem listing format (like `find` or `ls -R` output)
-    if any(line.endswith(':') for line in clean_lines):
+    if parser is _iter_filesystem_listing:
         try:
             return _parse_filesystem_listing(clean_lines)
         except Exception as e:
@@ -86,8 +100,117 @@ def parse_structure(lines: List[str]) -> List[Tuple[str, bool]]:
         raise StructureParseError(f"Could not parse structure format: {e}")
 
 
+# Number of non-empty lines used to tell the formats apart. parse_structure
+# and iter_structure share it, so a spec parses the same either way.
+DETECT_LINES = 64
+
+
+def iter_structure(lines: Iterable[str], lookahead: int = DETECT_LINES,
+                   grouped: bool = False) -> Iterator[Tuple[str, bool]]:
+    """
+    Lazily parse a stream of lines representing a project structure.
+
+    Unlike parse_structure, the input is not buffered: the format is detected
+    from the first ``lookahead`` non-empty lines (by the same rules as
+    parse_structure) and entries are yielded while the remaining lines are
+    still being read. Line-based formats (indented, tree-style, Markdown
+    lists, filesystem listings) are fully streamed; JSON and YAML documents
+    need the whole text and are parsed once input ends. Large tree/indented
+    lists and regular files may be parsed in a process pool, reading a
+    bounded number of lines ahead; pipes and other live streams never are.
+
+    Args:
+        lines: Any iterable of lines (a list, an open file, sys.stdin, ...)
+        lookahead: Number of non-empty lines used for format detection
+        grouped: Yield each directory's contents together, depth first, as
+            render_structure_stream needs. ``ls -R`` listings name a
+            directory's subdirectories before their contents, so they are
+            buffered and reordered, as are whole-document formats, which
+            are buffered anyway; the other line formats already are grouped.
+
+    Yields:
+        Tuples (path, is_directory)
+
+    Raises:
+        StructureParseError: If the input format cannot be parsed
+    """
+    source = iter(lines)
+    head = []
+    for line in source:
+        if line.strip():
+            head.append(line.rstrip())
+            if len(head) >= lookahead:
+                break
+
+    if not head:
+        raise StructureParseError("No valid input provided")
+
+    with stats.phase('detect'):
+        parser = _detect_stream_parser(head)
+    if parser is None:
+        # Whole-document formats: fall back to the buffered parser. A spec
+        # that only looked like YAML may still turn out to be a listing.
+        entries = parse_structure(head + [line for line in source])
+        yield from _regroup(entries) if grouped else entries
+        return
+
+    if parser is _iter_tree_or_indented and _is_complete_input(lines):
+        # Reading ahead costs no waiting, so large inputs may be sharded
+        parser = _iter_tree_or_indented_sharded
+    rest = (line.rstrip() for line in source if line.strip())
+    entries = parser(chain(head, rest))
+    recorder = stats.current()
+    if recorder is not None:
+        entries = recorder.timed_iter(_STREAM_PHASES[parser], entries)
+    if grouped and parser is _iter_filesystem_listing:
+        entries = _regroup(entries)
+    try:
+        yield from entries
+    except StructureParseError:
+        raise
+    except Exception as e:
+        raise StructureParseError(f"Could not parse structure format: {e}")
+
+
+def _detect_stream_parser(head: List[str]) -> Optional[Callable[[Iterable[str]], Iterator[Tuple[str, bool]]]]:
+    """Pick a streaming parser from the first lines, or None for whole-document formats"""
+    first = head[0].lstrip()[:1]
+    if first == '{' or first == '[':
+        return None
+
+    if _looks_like_yaml(head):
+        try:
+            import yaml  # noqa: F401
+            return None
+        except ImportError:
+            pass
+
+    return _detect_line_parser(head)
+
+
+def _looks_like_yaml(head: List[str]) -> bool:
+    """Return True if the first lines may be a YAML mapping rather than a tree drawing"""
+    return (any(':' in line for line in head)
+            and not any(line.strip().startswith('├') or line.strip().startswith('└') for line in head))
+
+
+def _detect_line_parser(head: List[str]) -> Callable[[Iterable[str]], Iterator[Tuple[str, bool]]]:
+    """Pick the line-based parser for a spec from its first lines"""
+    if any(_MARKDOWN_ITEM.match(line) for line in head):
+        return _iter_markdown_structure
+    if any(line.endswith(':') for line in head):
+        return _iter_filesystem_listing
+    return _iter_tree_or_indented
+
+
 def _parse_json_structure(json_text: str) -> List[Tuple[str, bool]]:
     """Parse JSON structure format"""
+    with stats.phase('parse.json'):
+        return _walk_json_structure(json_text)
+
+
+def _walk_json_structure(json_text: str) -> List[Tuple[str, bool]]:
+    """Walk a JSON document into (path, is_directory) entries"""
     import json
     paths = []
     
@@ -95,7 +218,11 @@ def _parse_json_structure(json_text: str) -> List[Tuple[str, bool]]:
         if isinstance(obj, dict):
             for k, v in obj.items():
                 current_path = os.path.join(prefix, k) if prefix else k
-                if isinstance(v, (dict, list)) and v:
+                if is_size_mapping(v):
+                    # {"size": ..., "mode": ..., "fill": ...} describes a sized file
+                    annotation = format_size_annotation(v["size"], v.get("mode"), v.get("fill"))
+                    paths.append((current_path + annotation, False))
+                elif isinstance(v, (dict, list)) and v:
                     paths.append((current_path, True))
                     walk_json(v, current_path)
                 elif isinstance(v, list) and not v:
@@ -125,13 +252,23 @@ def _parse_json_structure(json_text: str) -> List[Tuple[str, bool]]:
 
 def _parse_yaml_structure(yaml_text: str, yaml_module) -> List[Tuple[str, bool]]:
     """Parse YAML structure format"""
+    with stats.phase('parse.yaml'):
+        return _walk_yaml_structure(yaml_text, yaml_module)
+
+
+def _walk_yaml_structure(yaml_text: str, yaml_module) -> List[Tuple[str, bool]]:
+    """Walk a YAML document into (path, is_directory) entries"""
     paths = []
     
     def walk_yaml(obj, prefix=""):
         if isinstance(obj, dict):
             for k, v in obj.items():
                 current_path = os.path.join(prefix, k) if prefix else k
-                if isinstance(v, (dict, list)) and v:
+                if is_size_mapping(v):
+                    # {"size": ..., "mode": ..., "fill": ...} describes a sized file
+                    annotation = format_size_annotation(v["size"], v.get("mode"), v.get("fill"))
+                    paths.append((current_path + annotation, False))
+                elif isinstance(v, (dict, list)) and v:
                     paths.append((current_path, True))
                     walk_yaml(v, current_path)
                 elif isinstance(v, list) and not v:
@@ -160,52 +297,67 @@ def _parse_yaml_structure(yaml_text: str, yaml_module) -> List[Tuple[str, bool]]
 
 def _parse_markdown_structure(lines: List[str]) -> List[Tuple[str, bool]]:
     """Parse Markdown list format"""
-    paths = []
+    with stats.phase('parse.markdown'):
+        return list(_iter_markdown_structure(lines))
+
+
+_MARKDOWN_ITEM = re.compile(r'^(\s*)[-*+]\s+(.+)$')
+_MARKDOWN_CODE = re.compile(r'`([^`]+)`')
+_MARKDOWN_BOLD = re.compile(r'\*\*([^*]+)\*\*')
+_MARKDOWN_ITALIC = re.compile(r'\*([^*]+)\*')
+
+
+def _iter_markdown_structure(lines: Iterable[str]) -> Iterator[Tuple[str, bool]]:
+    """Lazily parse Markdown list format, yielding entries as lines arrive"""
     stack = []
+    # Columns per nesting level, taken from the first indented item (tabs count as 4)
+    width = 0
     
     for line in lines:
         # Match markdown list items: - item, * item, + item
-        match = re.match(r'^(\s*)[-*+]\s+(.+)$', line)
+        match = _MARKDOWN_ITEM.match(line)
         if not match:
             continue
             
         indent, name = match.groups()
-        depth = len(indent) // 2  # Assume 2 spaces per level
+        columns = len(indent.expandtabs(4))
+        if columns and not width:
+            width = columns
+        depth = columns // width if width else 0
+        
+        # Remove markdown formatting
+        if '`' in name:
+            name = _MARKDOWN_CODE.sub(r'\1', name)
+        if '*' in name:
+            name = _MARKDOWN_BOLD.sub(r'\1', name)
+            name = _MARKDOWN_ITALIC.sub(r'\1', name)
         
-        # Clean the name
-        name = name.strip()
+        # Clean the name and determine if it's a directory
+        name, is_directory = _normalize_name(name)
         if not name:
             continue
-            
-        # Remove markdown formatting
-        name = re.sub(r'`([^`]+)`', r'\1', name)  # Remove backticks
-        name = re.sub(r'\*\*([^*]+)\*\*', r'\1', name)  # Remove bold
-        name = re.sub(r'\*([^*]+)\*', r'\1', name)  # Remove italic
         
         # Adjust stack to current depth
         while len(stack) > depth:
             stack.pop()
-            
-        # Determine if it's a directory
-        is_directory = not _has_file_extension(name)
         
-        # Build path
-        if stack:
-            current_path = os.path.join(*stack, name)
-        else:
-            current_path = name
+        # The stack holds the parents' full paths, so a path is one concatenation
+        current_path = stack[-1] + os.sep + name if stack else name
             
-        paths.append((current_path, is_directory))
+        yield current_path, is_directory
         
         if is_directory:
-            stack.append(name)
-    
-    return paths
+            stack.append(current_path)
 
 
 def _parse_filesystem_listing(lines: List[str]) -> List[Tuple[str, bool]]:
     """Parse filesystem listing format (like find or ls -R output)"""
-    paths = []
+    with stats.phase('parse.listing'):
+        return list(_iter_filesystem_listing(lines))
+
+
+def _iter_filesystem_listing(lines: Iterable[str]) -> Iterator[Tuple[str, bool]]:
+    """Lazily parse filesystem listing format, yielding entries as lines arrive"""
     current_dir = ""
     
     for line in lines:
@@ -217,7 +369,7 @@ def _parse_filesystem_listing(lines: List[str]) -> List[Tuple[str, bool]]:
         if line.endswith(':'):
             current_dir = line[:-1]
             if current_dir and current_dir != '.':
-                paths.append((current_dir, True))
+                yield current_dir, True
         else:
             # File or directory in current directory
             if current_dir:
@@ -226,15 +378,31 @@ def _parse_filesystem_listing(lines: List[str]) -> List[Tuple[str, bool]]:
                 full_path = line
                 
             is_directory = not _has_file_extension(line)
-            paths.append((full_path, is_directory))
-    
-    return paths
+            yield full_path, is_directory
+
+
+def _regroup(entries: Iterable[Tuple[str, bool]]) -> Iterator[Tuple[str, bool]]:
+    """Buffer entries and yield them depth first, each directory's contents together"""
+    from .render import build_tree
+
+    def walk(children, prefix):
+        for name, node in children.items():
+            path = os.path.join(prefix, name) if prefix else name
+            yield path, node.is_dir
+            yield from walk(node.children, path)
+
+    yield from walk(build_tree(entries), "")
 
 
 def _parse_tree_or_indented(lines: List[str]) -> List[Tuple[str, bool]]:
     """Parse tree-style or simple indented format"""
+    with stats.phase('parse.tree'):
+        return list(_iter_tree_or_indented_sharded(lines))
+
+
+def _iter_tree_or_indented(lines: Iterable[str]) -> Iterator[Tuple[str, bool]]:
+    """Lazily parse tree-style or simple indented format, yielding entries as lines arrive"""
     stack = []
-    paths = []
     
     for line in lines:
         if not line.strip():
@@ -249,8 +417,9 @@ def _parse_tree_or_indented(lines: List[str]) -> List[Tuple[str, bool]]:
             before_content = re.match(r'^(\s*[│├└─\s]*)', line)
             if before_content:
                 prefix = before_content.group(1)
-                # Count depth based on tree symbols
-                depth = prefix.count('├') + prefix.count('└')
+                # Each level of a tree drawing is four columns wide ("│   " or "    ")
+                connector = max(prefix.rfind('├'), prefix.rfind('└'))
+                depth = connector // 4 + 1 if connector >= 0 else 0
                 if '├──' in line:
                     name = line.split('├──', 1)[1].strip()
                 elif '└──' in line:
@@ -274,31 +443,226 @@ def _parse_tree_or_indented(lines: List[str]) -> List[Tuple[str, bool]]:
                     depth = len(leading) // 4  # Assume 4 spaces per level
             name = stripped.strip()
         
-        # Clean the name
-        name = _clean_name(name)
+        # Clean the name and determine if it's a directory
+        name, is_directory = _normalize_name(name)
         if not name:
             continue
 
         # Adjust stack to current depth
         while len(stack) > depth:
             stack.pop()
-
-        # Determine if it's a directory
-        is_directory = not _has_file_extension(name)
         
-        # Build the full path
-        if stack:
-            current_path = os.path.join(*stack, name)
-        else:
-            current_path = name
+        # The stack holds the parents' full paths, so a path is one concatenation
+        current_path = stack[-1] + os.sep + name if stack else name
             
-        paths.append((current_path, is_directory))
+        yield current_path, is_directory
         
         # Add to stack if it's a directory
         if is_directory:
-            stack.append(name)
+            stack.append(current_path)
 
-    return paths
+
+# Inputs are cut into shards of at least this many lines; anything smaller
+# than two shards is parsed in-process
+SHARD_LINES = 50000
+
+
+def _iter_tree_or_indented_sharded(lines: Iterable[str], workers: Optional[int] = None,
+                                   shard_lines: Optional[int] = None) -> Iterator[Tuple[str, bool]]:
+    """
+    Parse tree-style or indented format across a process pool.
+
+    Every top-level (depth 0) entry resets the parser's directory stack, so
+    the input is cut only at those lines and each shard parses independently.
+    Shards are submitted as they are read and their results are yielded in
+    input order, with a bounded number in flight.
+
+    Cutting a shard means reading ahead, so this is only meant for complete
+    input (a list or a regular file; see iter_structure). The rest of the
+    input is parsed in-process, as a stream, in frozen executables, when
+    there is a single CPU, when a shard reaches twice shard_lines (default:
+    SHARD_LINES) without a top-level cut (e.g. ``tree`` output, which has
+    one root) or when the worker processes die.
+    """
+    workers = workers or os.cpu_count() or 1
+    shard_lines = shard_lines or SHARD_LINES
+    if workers < 2 or (os.cpu_count() or 1) < 2 or getattr(sys, 'frozen', False):
+        # A pool only adds overhead without a second CPU, and in a frozen
+        # executable (PyInstaller, Nuitka) spawned workers would re-run the program
+        yield from _iter_tree_or_indented(lines)
+        return
+
+    source = iter(lines)
+    shards = _iter_top_level_shards(source, shard_lines)
+    first = next(shards, None)
+    if first is None:
+        return
+    second = next(shards, None) if first[1] else None
+    if second is None:
+        yield from _iter_tree_or_indented(_remaining_lines(chain([first], shards), source))
+        return
+
+    try:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers)
+    except (ImportError, NotImplementedError, OSError):
+        yield from _iter_tree_or_indented(_remaining_lines(chain([first, second], shards), source))
+        return
+
+    from concurrent.futures.process import BrokenProcessPool
+    pending = deque()
+    # Shard being handed to the pool, kept until it is queued in pending
+    current = None
+    try:
+        for shard, complete in chain([first, second], shards):
+            current = shard
+            if not complete:
+                # No top-level cut within reach: finish the queued shards, then stream the rest
+                while pending:
+                    yield from _next_shard_result(pending)
+                current = None
+                yield from _iter_tree_or_indented(chain(shard, source))
+                break
+            pending.append((shard, pool.submit(_parse_shard, shard)))
+            current = None
+            while len(pending) > workers * 2:
+                yield from _next_shard_result(pending)
+        while pending:
+            yield from _next_shard_result(pending)
+    except BrokenProcessPool:
+        # Worker processes died (e.g. killed by resource limits): finish in-process
+        retry = [shard for shard, _ in pending]
+        if current is not None:
+            retry.append(current)
+        pending.clear()
+        yield from _iter_tree_or_indented(chain(chain.from_iterable(retry), _remaining_lines(shards, source)))
+    finally:
+        for _, future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+
+def _next_shard_result(pending: deque) -> List[Tuple[str, bool]]:
+    """
+    Wait for the oldest queued shard and dequeue it.
+
+    The shard stays queued until its result is in, so a pool that breaks
+    while it is parsed leaves it for the in-process fallback.
+    """
+    shard, future = pending[0]
+    entries = _shard_result(shard, future)
+    pending.popleft()
+    return entries
+
+
+def _shard_result(shard: List[str], future) -> List[Tuple[str, bool]]:
+    """Wait for a shard, re-raising worker failures as parse errors"""
+    from concurrent.futures.process import BrokenProcessPool
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        raise
+    except Exception as e:
+        raise StructureParseError(f"Could not parse structure format: {e}")
+
+
+def _parse_shard(lines: List[str]) -> List[Tuple[str, bool]]:
+    """Process pool entry point for one shard"""
+    return list(_iter_tree_or_indented(lines))
+
+
+def _iter_top_level_shards(lines: Iterator[str], shard_lines: int) -> Iterator[Tuple[List[str], bool]]:
+    """
+    Group lines into (shard, complete) pairs of at least shard_lines, cut before depth 0 entries.
+
+    A shard that reaches twice shard_lines without a cut is yielded as
+    incomplete and ends the iteration, leaving the rest of the input in
+    ``lines``, so read-ahead stays bounded.
+    """
+    shard = []
+    limit = shard_lines * 2
+    for line in lines:
+        if len(shard) >= shard_lines and _is_top_level_entry(line):
+            yield shard, True
+            shard = []
+        shard.append(line)
+        if len(shard) >= limit:
+            yield shard, False
+            return
+    if shard:
+        yield shard, True
+
+
+def _remaining_lines(shards: Iterable[Tuple[List[str], bool]], source: Iterator[str]) -> Iterator[str]:
+    """Lines of the given shards followed by whatever input they did not read"""
+    for shard, complete in shards:
+        yield from shard
+        if not complete:
+            break
+    yield from source
+
+
+def _is_top_level_entry(line: str) -> bool:
+    """Return True if _iter_tree_or_indented would place a named entry at depth 0"""
+    if not line or line[0].isspace():
+        return False
+    if '├──' in line or '└──' in line or '│' in line:
+        return False
+    return bool(_clean_name(line.strip()))
+
+
+def _is_complete_input(lines: Iterable[str]) -> bool:
+    """
+    Return True for input that can be read ahead without waiting on a
+    producer: lists and regular files, not pipes, sockets or stdin streams.
+    """
+    if isinstance(lines, (list, tuple)):
+        return True
+    seekable = getattr(lines, 'seekable', None)
+    try:
+        return bool(seekable is not None and seekable())
+    except (OSError, ValueError):
+        return False
+
+
+# Phase names used when streamed parsing is instrumented
+_STREAM_PHASES = {
+    _iter_markdown_structure: 'parse.markdown',
+    _iter_filesystem_listing: 'parse.listing',
+    _iter_tree_or_indented: 'parse.tree',
+    _iter_tree_or_indented_sharded: 'parse.tree',
+}
+
+
+# Distinct names remembered by the name caches. Specs repeat a small set of
+# names (src, res, __init__.py, ...) many times; unique names just cycle through.
+NAME_CACHE_SIZE = 16384
+
+_FILE_EXTENSIONS = (
+    '.txt', '.md', '.py', '.js', '.ts', '.html', '.css', '.json', '.xml', '.yml', '.yaml',
+    '.java', '.kt', '.swift', '.cpp', '.c', '.h', '.cs', '.php', '.rb', '.go', '.rs',
+    '.gradle', '.pro', '.properties', '.manifest', '.gitignore', '.dockerfile',
+    '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.pdf', '.zip', '.tar', '.gz'
+)
+
+_SPECIAL_FILES = frozenset({
+    'readme', 'license', 'changelog', 'makefile', 'dockerfile', 'gemfile',
+    'rakefile', 'gulpfile', 'gruntfile', 'package-lock', 'yarn'
+})
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _normalize_name(raw: str) -> Tuple[str, bool]:
+    """
+    Clean and classify a raw entry name, returning (name, is_directory).
+
+    Memoized, so a repeated name costs one cache lookup, and the cleaned
+    name is interned so every path built from it shares one string.
+    """
+    name = _clean_name(raw)
+    if not name:
+        return "", False
+    return sys.intern(name), not _has_file_extension(name)
 
 
 def _clean_name(name: str) -> str:
@@ -320,22 +684,24 @@ def _clean_name(name: str) -> str:
     return name.strip()
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def _has_file_extension(name: str) -> bool:
     """Check if a name has a file extension"""
-    # Known file extensions
-    file_extensions = {
-        '.txt', '.md', '.py', '.js', '.ts', '.html', '.css', '.json', '.xml', '.yml', '.yaml',
-        '.java', '.kt', '.swift', '.cpp', '.c', '.h', '.cs', '.php', '.rb', '.go', '.rs',
-        '.gradle', '.pro', '.properties', '.manifest', '.gitignore', '.dockerfile',
-        '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.pdf', '.zip', '.tar', '.gz'
-    }
+    # Sized entries are always files
+    if has_size_annotation(name):
+        return True
     
+    # Brace patterns are classified by what they expand to
+    if '{' in name:
+        name = first_expansion(name)
+    
+    # Flat paths (app/Makefile) are classified by their last component
+    name = name.rstrip('/\\').rsplit('/', 1)[-1].rsplit('\\', 1)[-1]
     name_lower = name.lower()
     
     # Check for known extensions
-    for ext in file_extensions:
-        if name_lower.endswith(ext):
-            return True
+    if name_lower.endswith(_FILE_EXTENSIONS):
+        return True
     
     # Check for files with dots but unknown extensions
     if '.' in name and not name.startswith('.'):
@@ -344,21 +710,21 @@ def _has_file_extension(name: str) -> bool:
             return True
     
     # Special cases for files without extensions
-    special_files = {
-        'readme', 'license', 'changelog', 'makefile', 'dockerfile', 'gemfile',
-        'rakefile', 'gulpfile', 'gruntfile', 'package-lock', 'yarn'
-    }
-    
-    return name_lower in special_files
+    return name_lower in _SPECIAL_FILES
 
 
-def create_structure(base_path: str, structure_lines: List[str]) -> None:
+def create_structure(base_path: str, structure_lines: List[str], dedup: Optional[str] = None,
+                     scheduler: Optional[OpScheduler] = None) -> None:
     """
     Create the project structure based on the parsed lines.
     
     Args:
         base_path: Base directory where the structure will be created
         structure_lines: List of strings representing the structure
+        dedup: Optional "hardlink" or "reflink" to write each distinct sized
+            file content once and link the duplicates
+        scheduler: Optional OpScheduler limiting the rate and concurrency
+            of file system operations
         
     Raises:
         StructureParseError: If the structure cannot be parsed
@@ -374,37 +740,249 @@ def create_structure(base_path: str, structure_lines: List[str]) -> None:
     if not paths:
         raise StructureParseError("No valid structure found")
     
-    created_dirs = set()
-    created_files = []
+    _materialize(base_path, paths, dedup=dedup, scheduler=scheduler)
+
+
+def create_structure_stream(base_path: str, lines: Iterable[str],
+                            log: Callable[[str], None] = print, dedup: Optional[str] = None,
+                            scheduler: Optional[OpScheduler] = None) -> int:
+    """
+    Create the project structure while the input is still being read.
+
+    Entries are parsed with iter_structure and created as soon as they are
+    parsed, so parsing and file system work overlap with whatever process
+    produces the input (e.g. ``tree | project-structure-creator - out``).
+
+    Args:
+        base_path: Base directory where the structure will be created
+        lines: Any iterable of lines (a list, an open file, sys.stdin, ...)
+        log: Callable receiving one progress message per entry
+        dedup: Optional "hardlink" or "reflink" to write each distinct sized
+            file content once and link the duplicates
+        scheduler: Optional OpScheduler limiting the rate and concurrency
+            of file system operations
+
+    Returns:
+        Number of entries processed
+
+    Raises:
+        StructureParseError: If the structure cannot be parsed
+        OSError: If file/directory creation fails
+    """
+    count = _materialize(base_path, iter_structure(lines), log, dedup, scheduler)
+    if not count:
+        raise StructureParseError("No valid structure found")
+    return count
+
+
+def _materialize(base_path: str, entries: Iterable[Tuple[str, bool]],
+                 log: Callable[[str], None] = print, dedup: Optional[str] = None,
+                 scheduler: Optional[OpScheduler] = None) -> int:
+    """Create parsed entries under base_path, returning the number of entries processed"""
+    # Bounded so memory stays flat for huge (e.g. brace-expanded) structures;
+    # os.makedirs(exist_ok=True) keeps evicted paths correct
+    created_dirs = _RecentPaths()
+    count = 0
+    # Looked up once so disabled instrumentation costs one branch per entry
+    recorder = stats.current()
+    dir_fds = _DirFdCache(recorder) if _HAS_DIR_FD else None
+    deduplicator = Deduplicator(dedup) if dedup else None
+    op = scheduler.op if scheduler is not None else no_op
     
     try:
-        for path, is_dir in paths:
+        for path, is_dir in expand_entries(entries):
+            count += 1
             full_path = os.path.join(base_path, path)
             
             if is_dir:
                 if full_path not in created_dirs:
-                    os.makedirs(full_path, exist_ok=True)
+                    with op(), stats.phase('mkdir'):
+                        os.makedirs(full_path, exist_ok=True)
                     created_dirs.add(full_path)
-                    print(f"Created directory: {full_path}")
+                    if recorder is not None:
+                        recorder.count('mkdir')
+                        recorder.count('dirs')
+                    log(f"Created directory: {full_path}")
+                continue
+            
+            full_path, spec = split_size_annotation(full_path)
+            described = f"{full_path} ({format_size(spec.size)} {spec.mode})" if spec else full_path
+            
+            outcome = None
+            if deduplicator is not None and deduplicator.applies_to(spec):
+                with op(), stats.phase('write'):
+                    _ensure_parent(full_path, dir_fds, created_dirs, recorder)
+                    outcome = deduplicator.link(full_path, spec)
+                if outcome == LINKED:
+                    if recorder is not None:
+                        recorder.count('files')
+                        recorder.count('linked')
+                    log(f"Linked file: {described}")
+                    continue
+            
+            if outcome is None:
+                with op(), stats.phase('write'):
+                    created = _create_file(full_path, spec, dir_fds, created_dirs, recorder)
             else:
-                dir_path = os.path.dirname(full_path)
-                if dir_path and dir_path not in created_dirs:
-                    os.makedirs(dir_path, exist_ok=True)
-                    created_dirs.add(dir_path)
-                
-                # Only create file if it doesn't exist
-                if not os.path.exists(full_path):
-                    with open(full_path, 'w', encoding='utf-8') as f:
-                        f.write('')  # Empty file
-                    created_files.append(full_path)
-                    print(f"Created file: {full_path}")
-                else:
-                    print(f"File already exists, skipped: {full_path}")
+                created = outcome == COPIED
+            
+            if created:
+                if deduplicator is not None and deduplicator.applies_to(spec):
+                    deduplicator.remember(spec, full_path)
+                if recorder is not None:
+                    recorder.count('files')
+                    if spec:
+                        recorder.count('bytes', spec.size)
+                log(f"Created file: {described}")
+            else:
+                if recorder is not None:
+                    recorder.count('skipped')
+                log(f"File already exists, skipped: {full_path}")
+        
+        if deduplicator is not None:
+            log(deduplicator.format_report())
                     
+    except StructureParseError:
+        raise
     except OSError as e:
         raise OSError(f"Failed to create structure: {e}")
     except Exception as e:
         raise Exception(f"Unexpected error creating structure: {e}")
+    finally:
+        if dir_fds is not None:
+            dir_fds.close()
+        if recorder is not None:
+            recorder.count('entries', count)
+            if deduplicator is not None:
+                recorder.count('bytes_saved', deduplicator.bytes_saved)
+    
+    return count
+
+
+def _create_file(full_path: str, spec: Optional[FileSpec], dir_fds: Optional["_DirFdCache"],
+                 created_dirs: "_RecentPaths", recorder) -> bool:
+    """Create one file unless it exists, returning True if it was created"""
+    if dir_fds is not None:
+        # POSIX fast path: create relative to a cached directory fd
+        dir_path, name = os.path.split(full_path)
+        return dir_fds.create_file(dir_path, name, spec)
+    
+    _ensure_parent(full_path, dir_fds, created_dirs, recorder)
+    if recorder is not None:
+        recorder.count('stat')
+    
+    # Only create file if it doesn't exist
+    if os.path.exists(full_path):
+        return False
+    with open(full_path, 'w', encoding='utf-8') as f:
+        if spec:
+            write_content(f.fileno(), spec)
+        else:
+            f.write('')  # Empty file
+    if recorder is not None:
+        recorder.count('open')
+    return True
+
+
+def _ensure_parent(full_path: str, dir_fds: Optional["_DirFdCache"],
+                   created_dirs: "_RecentPaths", recorder) -> None:
+    """Make sure the parent directory of full_path exists"""
+    dir_path = os.path.dirname(full_path)
+    if dir_fds is not None:
+        dir_fds.get(dir_path)
+    elif dir_path and dir_path not in created_dirs:
+        os.makedirs(dir_path, exist_ok=True)
+        created_dirs.add(dir_path)
+        if recorder is not None:
+            recorder.count('mkdir')
+
+
+class _RecentPaths:
+    """Set of the most recently added paths, evicting the oldest beyond a limit"""
+
+    def __init__(self, limit: int = 4096):
+        self.limit = limit
+        self.paths = OrderedDict()
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.paths
+
+    def add(self, path: str) -> None:
+        self.paths[path] = None
+        if len(self.paths) > self.limit:
+            self.paths.popitem(last=False)
+
+
+# Relative-to-directory file creation is available on POSIX platforms
+_HAS_DIR_FD = (os.name == 'posix' and hasattr(os, 'O_DIRECTORY')
+               and os.open in os.supports_dir_fd)
+
+
+class _DirFdCache:
+    """
+    Bounded LRU of open directory file descriptors.
+
+    Files are created with ``O_CREAT | O_EXCL`` relative to their parent's fd,
+    which replaces the existence probe, the full-path lookup and the empty
+    write of the portable path with a single open plus close. Missing parent
+    directories are created on demand, so no separate bookkeeping of created
+    directories is needed.
+    """
+
+    FILE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_CLOEXEC', 0)
+    DIR_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0) | getattr(os, 'O_CLOEXEC', 0)
+
+    def __init__(self, recorder=None, max_open: int = 64):
+        self.recorder = recorder
+        self.max_open = max_open
+        self.fds = OrderedDict()
+
+    def get(self, dir_path: str) -> int:
+        """Return an fd for dir_path, creating the directory if it is missing"""
+        dir_path = dir_path or '.'
+        fd = self.fds.get(dir_path)
+        if fd is not None:
+            self.fds.move_to_end(dir_path)
+            return fd
+        
+        try:
+            fd = os.open(dir_path, self.DIR_FLAGS)
+        except FileNotFoundError:
+            os.makedirs(dir_path, exist_ok=True)
+            if self.recorder is not None:
+                self.recorder.count('mkdir')
+            fd = os.open(dir_path, self.DIR_FLAGS)
+        if self.recorder is not None:
+            self.recorder.count('open')
+        
+        self.fds[dir_path] = fd
+        if len(self.fds) > self.max_open:
+            _, oldest = self.fds.popitem(last=False)
+            os.close(oldest)
+        return fd
+
+    def create_file(self, dir_path: str, name: str, spec: Optional[FileSpec] = None,
+                    mode: int = 0o666) -> bool:
+        """Create a file (empty unless spec says otherwise), returning False if it already exists"""
+        dir_fd = self.get(dir_path)
+        if self.recorder is not None:
+            self.recorder.count('open')
+        try:
+            fd = os.open(name, self.FILE_FLAGS, mode, dir_fd=dir_fd)
+        except FileExistsError:
+            return False
+        try:
+            if spec is not None:
+                write_content(fd, spec)
+        finally:
+            os.close(fd)
+        return True
+
+    def close(self) -> None:
+        """Close every cached descriptor"""
+        while self.fds:
+            _, fd = self.fds.popitem()
+            os.close(fd)
 
 
 def validate_structure_input(lines: List[str]) -> Tuple[bool, str]:
@@ -441,10 +1019,15 @@ def validate_structure_input(lines: List[str]) -> Tuple[bool, str]:
         return False, f"Unknown parsing error: {e}"
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     """Main entry point for the command-line interface."""
     import argparse
     
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in _COMMANDS:
+        _COMMANDS[argv[0]](argv[1:])
+        return
+    
     parser = argparse.ArgumentParser(
         description="Create project structures from text descriptions",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -452,8 +1035,19 @@ def main() -> None:
 Examples:
   project-structure-creator structure.txt ~/Desktop/my_project
   project-structure-creator structure.txt C:\\Users\\username\\Documents\\my_project
+  tree -F my_project | project-structure-creator - ~/Desktop/copy
+  project-structure-creator docs/design.md ./out --markdown "Directory layout"
+  project-structure-creator structure.txt --target /srv/a --target /srv/b --workers 8
+  project-structure-creator huge_spec.txt.gz --dry-run | head -50
   project-structure-creator --gui
   python -m project_structure_creator --gui
+
+Commands:
+  project-structure-creator diff OLD NEW [--format FMT]
+  project-structure-creator merge BASE OTHER [--format FMT]
+  project-structure-creator serve [--socket PATH] [--workers N]
+  project-structure-creator plan SPEC --partitions N [--output-dir DIR]
+  project-structure-creator apply-partition PARTITION_FILE OUTPUT_DIR
         """
     )
     
@@ -461,7 +1055,7 @@ Examples:
         "input_file", 
         nargs="?", 
         default="structure.txt",
-        help="Input file containing the project structure (default: structure.txt)"
+        help="Input file containing the project structure, or '-' to read from stdin (default: structure.txt)"
     )
     parser.add_argument(
         "output_dir", 
@@ -473,13 +1067,92 @@ Examples:
         action="store_true",
         help="Launch the graphical user interface"
     )
+    parser.add_argument(
+        "--dedup",
+        choices=DEDUP_METHODS,
+        help="Write each distinct sized file content once and hardlink or reflink the duplicates"
+    )
+    parser.add_argument(
+        "--target",
+        action="append",
+        default=[],
+        metavar="DIR",
+        help="Additional output directory; the structure is planned once and created in every target (repeatable)"
+    )
+    parser.add_argument(
+        "--targets-file",
+        metavar="PATH",
+        help="File listing additional output directories, one per line"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of targets created concurrently (default: min(32, CPUs + 4))"
+    )
+    parser.add_argument(
+        "--markdown",
+        metavar="HEADING",
+        nargs="?",
+        const="",
+        help="Treat INPUT_FILE as a Markdown document and use its first embedded structure "
+             "(the first under a heading containing HEADING, if given)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the parsed structure instead of creating it; output starts while the spec is still "
+             "being read (brace patterns are shown unexpanded)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="tree",
+        help="Output format for --dry-run (default: tree)"
+    )
+    _add_throttle_arguments(parser)
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and apply changes to the input file as it is edited"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        metavar="SECONDS",
+        help="Polling interval for --watch (default: 0.5)"
+    )
+    parser.add_argument(
+        "--connect",
+        metavar="SOCKET",
+        nargs="?",
+        const="",
+        help="Forward the request to a daemon started with 'serve' (default socket if omitted)"
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print per-phase timings, file system call counts and throughput"
+    )
+    parser.add_argument(
+        "--stats-json",
+        metavar="PATH",
+        help="Write the statistics as JSON to PATH"
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help="Write a Chrome trace file (chrome://tracing, Perfetto, speedscope) to PATH"
+    )
     parser.add_argument(
         "--version", 
         action="version", 
         version="%(prog)s 0.1.0"
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Launch GUI if requested
     if args.gui:
@@ -494,34 +1167,380 @@ Examples:
     
     # CLI mode
     input_file = args.input_file
+    if args.dry_run:
+        _run_dry_run(args, input_file)
+        return
     output_dir = args.output_dir
+    targets = ([output_dir] if output_dir else []) + args.target
+    if args.targets_file:
+        with open(args.targets_file, 'r', encoding='utf-8') as f:
+            targets.extend(line.strip() for line in f if line.strip())
     
-    if not output_dir:
+    if not targets:
         print("Error: Output directory is required for CLI mode.")
         print(f"Usage: {sys.argv[0]} [input_file] [output_dir]")
         print(f"       {sys.argv[0]} --gui")
         sys.exit(1)
 
-    if not os.path.exists(input_file):
+    from_stdin = input_file == '-'
+    if not from_stdin and not os.path.exists(input_file):
         print(f"Error: Input file '{input_file}' not found.")
         print(f"Usage: {sys.argv[0]} [input_file] [output_dir]")
         print(f"       {sys.argv[0]} --gui")
         sys.exit(1)
     
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            lines = [line.rstrip('\n') for line in f if line.strip()]
-        
-        print(f"Reading structure from: {input_file}")
+        scheduler = _scheduler_from_args(args)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    if len(targets) > 1:
+        if args.connect is not None or args.watch:
+            print("Error: --connect and --watch take a single output directory.")
+            sys.exit(1)
+        _run_fanout(args, input_file, targets, scheduler)
+        return
+    output_dir = targets[0]
+    
+    if args.connect is not None:
+        _run_client(args, input_file, output_dir)
+        return
+    
+    if args.watch:
+        if from_stdin or args.markdown is not None:
+            print("Error: --watch needs a plain structure file, not stdin or --markdown.")
+            sys.exit(1)
+        from .watch import watch_structure
+        print(f"Watching {input_file} (Ctrl+C to stop)")
+        try:
+            watch_structure(input_file, output_dir, args.interval, log=_log_flush, dedup=args.dedup,
+                            scheduler=scheduler)
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+        return
+    
+    if args.stats or args.stats_json or args.trace:
+        stats.enable(trace=bool(args.trace))
+    
+    try:
+        print(f"Reading structure from: {'<stdin>' if from_stdin else input_file}")
         print(f"Creating structure at: {output_dir}")
         print()
         
-        create_structure(output_dir, lines)
+        # Entries are created while the input is still being read
+        create_structure_stream(output_dir, _spec_lines(args, input_file), log=_log_flush,
+                                dedup=args.dedup, scheduler=scheduler)
+        if scheduler is not None:
+            print(scheduler.format_report())
         print(f"\n✅ Project structure created successfully at '{output_dir}/'")
         
     except Exception as e:
         print(f"❌ Error: {e}")
         sys.exit(1)
+    finally:
+        _report_stats(args)
+
+
+def _run_dry_run(args, input_file: str) -> None:
+    """Stream the parsed structure to stdout without creating anything"""
+    if input_file != '-' and not os.path.exists(input_file):
+        print(f"Error: Input file '{input_file}' not found.", file=sys.stderr)
+        sys.exit(1)
+    try:
+        sys.stdout.writelines(line + "\n" for line in
+                              render_structure_stream(iter_structure(_spec_lines(args, input_file),
+                                                                     grouped=True), args.format))
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader (e.g. head) has seen enough; silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _run_fanout(args, input_file: str, targets: List[str], scheduler: Optional[OpScheduler]) -> None:
+    """Create one parsed structure in several output directories"""
+    from .plan import create_structure_many
+    
+    if args.stats or args.stats_json or args.trace:
+        stats.enable(trace=bool(args.trace))
+    
+    def report(result) -> None:
+        if result.ok:
+            _log_flush(f"✅ {result.target}: {result.dirs} directories, {result.files} files, "
+                       f"{result.skipped} skipped ({result.seconds * 1000:.1f} ms)")
+        else:
+            _log_flush(f"❌ {result.target}: {result.error}")
+    
+    try:
+        print(f"Reading structure from: {'<stdin>' if input_file == '-' else input_file}")
+        print(f"Creating structure in {len(targets)} targets")
+        print()
+        results = create_structure_many(targets, _spec_lines(args, input_file),
+                                        max_workers=args.workers, dedup=args.dedup,
+                                        scheduler=scheduler, on_result=report)
+        if scheduler is not None:
+            print(scheduler.format_report())
+        failed = sum(1 for result in results if not result.ok)
+        print(f"\n{len(results) - failed} of {len(results)} targets created successfully")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        _report_stats(args)
+    if failed:
+        sys.exit(1)
+
+
+def _add_throttle_arguments(parser) -> None:
+    """Options configuring an OpScheduler"""
+    parser.add_argument(
+        "--max-ops",
+        type=float,
+        metavar="N",
+        help="Limit file system operations to N per second"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        metavar="N",
+        help="Limit file system operations in flight to N"
+    )
+    parser.add_argument(
+        "--target-latency",
+        type=float,
+        metavar="MS",
+        help="Lower the --max-ops rate while average operation latency exceeds MS milliseconds"
+    )
+
+
+def _scheduler_from_args(args) -> Optional[OpScheduler]:
+    """Build the OpScheduler requested on the command line, if any"""
+    if args.max_ops is None and args.max_concurrency is None and args.target_latency is None:
+        return None
+    target_latency = args.target_latency / 1000 if args.target_latency is not None else None
+    return OpScheduler(args.max_ops, max_concurrency=args.max_concurrency, target_latency=target_latency)
+
+
+def _report_stats(args) -> None:
+    """Print and export statistics requested on the command line"""
+    recorder = stats.disable()
+    if recorder is None:
+        return
+    if args.stats:
+        print()
+        print(recorder.format_report())
+    if args.stats_json:
+        recorder.write_json(args.stats_json)
+    if args.trace:
+        recorder.write_chrome_trace(args.trace)
+
+
+def _spec_lines(args, input_file: str) -> Iterable[str]:
+    """Lines of the spec named on the command line, honouring --markdown"""
+    lines = read_structure_lines(input_file)
+    if args.markdown is None:
+        return lines
+    from .markdown import select_structure_block
+    block = select_structure_block(lines, args.markdown or None)
+    print(f"Using structure block at line {block.line}" + (f" under '{block.heading}'" if block.heading else ""),
+          file=sys.stderr if args.dry_run else sys.stdout)
+    return block.lines
+
+
+def read_structure_lines(path: str) -> Iterator[str]:
+    """
+    Lazily read the lines of a structure file, or stdin when path is '-'.
+
+    gzip, bzip2 and xz compressed input is detected and decompressed on the
+    fly (see sources.py).
+
+    Args:
+        path: File path, or '-' for standard input
+
+    Yields:
+        Lines without trailing newlines
+    """
+    if path != '-':
+        return read_lines(path)
+    if hasattr(sys.stdin, 'buffer'):
+        return read_stream_lines(sys.stdin.buffer)
+    return (line.rstrip('\n') for line in sys.stdin)
+
+
+def _load_spec(path: str) -> List[Tuple[str, bool]]:
+    """Read and parse a structure file for the comparison commands"""
+    if path != '-' and not os.path.exists(path):
+        raise StructureParseError(f"Input file '{path}' not found.")
+    return parse_structure(list(read_structure_lines(path)))
+
+
+def _run_diff(argv: List[str]) -> None:
+    """Compare two structure specs without creating anything"""
+    import argparse
+    from .diff import diff_structures, render_diff
+    from .render import OUTPUT_FORMATS
+    
+    parser = argparse.ArgumentParser(
+        prog="project-structure-creator diff",
+        description="Show paths added, removed or changed between file and directory from OLD to NEW. "
+                    "Exits with status 1 when the specs differ."
+    )
+    parser.add_argument("old", help="Base structure file (any supported format, '-' for stdin)")
+    parser.add_argument("new", help="Changed structure file (any supported format, '-' for stdin)")
+    parser.add_argument("--format", "-f", choices=OUTPUT_FORMATS, default="flat",
+                        help="Output format (default: flat)")
+    args = parser.parse_args(argv)
+    
+    try:
+        diff = diff_structures(_load_spec(args.old), _load_spec(args.new))
+        for line in render_diff(diff, args.format):
+            print(line)
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(2)
+    sys.exit(0 if diff.is_empty else 1)
+
+
+def _run_merge(argv: List[str]) -> None:
+    """Merge two structure specs and print the result"""
+    import argparse
+    from .diff import merge_structures
+    from .render import OUTPUT_FORMATS, render_structure
+    
+    parser = argparse.ArgumentParser(
+        prog="project-structure-creator merge",
+        description="Print the union of two structure specs in any supported output format"
+    )
+    parser.add_argument("base", help="First structure file (any supported format, '-' for stdin)")
+    parser.add_argument("other", help="Second structure file (any supported format, '-' for stdin)")
+    parser.add_argument("--format", "-f", choices=OUTPUT_FORMATS, default="tree",
+                        help="Output format (default: tree)")
+    parser.add_argument("--prefer", choices=("base", "other"), default="other",
+                        help="Which spec decides file vs directory when they disagree (default: other)")
+    args = parser.parse_args(argv)
+    
+    try:
+        merged = merge_structures(_load_spec(args.base), _load_spec(args.other), args.prefer)
+        for line in render_structure(merged, args.format):
+            print(line)
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+
+def _run_plan(argv: List[str]) -> None:
+    """Split a spec into partition files"""
+    import argparse
+    from .plan import partition_plan, write_partition
+    
+    parser = argparse.ArgumentParser(
+        prog="project-structure-creator plan",
+        description="Parse a spec once and write N balanced, disjoint partitions "
+                    "to create with 'apply-partition', e.g. on different machines"
+    )
+    parser.add_argument("input_file", help="Structure file (any supported format, '-' for stdin)")
+    parser.add_argument("--partitions", "-n", type=int, required=True, metavar="N",
+                        help="Number of partitions")
+    parser.add_argument("--output-dir", "-o", default=".",
+                        help="Directory for the partition-NNNN.json files (default: current directory)")
+    args = parser.parse_args(argv)
+    
+    try:
+        partitions = partition_plan(_load_spec(args.input_file), args.partitions)
+        os.makedirs(args.output_dir, exist_ok=True)
+        print(f"Shared directories: {len(partitions[0].shared_dirs) if partitions else 0}")
+        for partition in partitions:
+            path = os.path.join(args.output_dir, f"partition-{partition.index + 1:04d}.json")
+            write_partition(partition, path)
+            print(f"{path}: {partition.entries} entries")
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _run_apply_partition(argv: List[str]) -> None:
+    """Create one partition written by the plan command"""
+    import argparse
+    from .plan import apply_partition, read_partition
+    
+    parser = argparse.ArgumentParser(
+        prog="project-structure-creator apply-partition",
+        description="Create the shared directories and one partition written by 'plan'"
+    )
+    parser.add_argument("partition_file", help="partition-NNNN.json written by 'plan'")
+    parser.add_argument("output_dir", help="Output directory, the same for every partition")
+    parser.add_argument("--dedup", choices=DEDUP_METHODS,
+                        help="Write each distinct sized file content once and link the duplicates")
+    parser.add_argument("--quiet", "-q", action="store_true", help="Only print the summary")
+    _add_throttle_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    try:
+        partition = read_partition(args.partition_file)
+        result = apply_partition(args.output_dir, partition, log=None if args.quiet else _log_flush,
+                                 dedup=args.dedup, scheduler=_scheduler_from_args(args))
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"\n✅ Partition {partition.index + 1} of {partition.count} created at '{args.output_dir}/': "
+          f"{result.dirs} directories, {result.files} files, {result.skipped} skipped "
+          f"({result.seconds * 1000:.1f} ms)")
+
+
+def _run_serve(argv: List[str]) -> None:
+    """Run the warm daemon"""
+    import argparse
+    from .daemon import default_socket_path, serve
+    
+    parser = argparse.ArgumentParser(
+        prog="project-structure-creator serve",
+        description="Keep a warm process listening on a Unix socket; "
+                    "use 'project-structure-client' or --connect to send it requests"
+    )
+    parser.add_argument("--socket", default=default_socket_path(),
+                        help="Unix socket path (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Number of requests handled concurrently (default: 4)")
+    _add_throttle_arguments(parser)
+    args = parser.parse_args(argv)
+    
+    try:
+        # One scheduler for the daemon, so its limits hold across concurrent requests
+        serve(args.socket, args.workers, scheduler=_scheduler_from_args(args))
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _run_client(args, input_file: str, output_dir: str) -> None:
+    """Forward a create request to the daemon"""
+    from .daemon import default_socket_path, run_client
+    
+    try:
+        count = run_client(args.connect or default_socket_path(), _spec_lines(args, input_file),
+                           output_dir, dedup=args.dedup)
+        print(f"\n✅ Project structure created successfully at '{output_dir}/' ({count} entries)")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+# Subcommands recognised as the first command-line argument
+_COMMANDS = {
+    "diff": _run_diff,
+    "merge": _run_merge,
+    "serve": _run_serve,
+    "plan": _run_plan,
+    "apply-partition": _run_apply_partition,
+}
+
+
+def _log_flush(message: str) -> None:
+    """Print a progress message immediately, even when stdout is a pipe"""
+    print(message, flush=True)
 
 
 if __name__ == "__main__":
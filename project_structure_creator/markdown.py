@@ -0,0 +1,142 @@
+"""
+Structure extraction from Markdown documents for Project Structure Creator
+
+Design docs often embed their skeletons as a fenced code block (a tree or an
+indented listing) or as a nested bullet list. find_structure_blocks scans a
+document once, line by line, and yields only the blocks whose content looks
+like a file tree; everything else (prose, code, tables) is skipped without
+being parsed. Each block records the heading it appears under, so a specific
+skeleton can be selected by heading.
+"""
+
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from .content import split_size_annotation
+from .main import _MARKDOWN_ITEM, StructureParseError, _clean_name
+
+_HEADING = re.compile(r'^ {0,3}#{1,6}\s+(.*?)(?:\s+#+)?\s*$')
+_FENCE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+# Tree drawing, ASCII tree and bullet characters in front of a name
+_DRAWING = re.compile(r'^[\s│├└─┬┼|`+*\\-]*')
+_FORMATTING = re.compile(r'[`*]')
+_PATH_LIKE = re.compile(r'^[\w.@$~{}()\[\]+,=-]+(?:/[\w.@$~{}()\[\]+,=-]+)*/?$')
+
+# Share of lines that must look like paths for a block to count as a structure
+MIN_PATH_SHARE = 0.8
+
+
+class StructureBlock(NamedTuple):
+    """A structure embedded in a Markdown document"""
+
+    heading: Optional[str]  # nearest heading above the block
+    line: int  # 1-based line number of the block's first line
+    kind: str  # "fence" or "list"
+    lines: List[str]
+
+
+def find_structure_blocks(lines: Iterable[str]) -> Iterator[StructureBlock]:
+    """
+    Scan a Markdown document for fenced blocks and lists that look like structures.
+
+    Args:
+        lines: Lines of the document
+
+    Yields:
+        StructureBlock for every candidate, in document order
+    """
+    heading = None
+    fence = None  # closing marker while inside a fenced block
+    block: List[str] = []
+    start = 0
+    blank_run = 0
+
+    for number, line in enumerate(lines, 1):
+        stripped = line.lstrip()
+
+        if fence is not None:
+            if stripped.startswith(fence) and not stripped.lstrip(fence[0]).strip():
+                if _looks_like_structure(block):
+                    yield StructureBlock(heading, start, "fence", block)
+                fence = None
+                block = []
+            else:
+                block.append(line.rstrip())
+            continue
+
+        first = stripped[:1]
+        if block:
+            # Inside a list section: items and blank lines keep it going
+            if first in ('-', '*', '+') and _MARKDOWN_ITEM.match(line):
+                block.extend([''] * blank_run)
+                block.append(line.rstrip())
+                blank_run = 0
+                continue
+            if not stripped:
+                blank_run += 1
+                continue
+            if _looks_like_structure(block):
+                yield StructureBlock(heading, start, "list", block)
+            block = []
+            blank_run = 0
+
+        if first == '#':
+            match = _HEADING.match(line)
+            if match:
+                heading = match.group(1)
+        elif first in ('`', '~'):
+            match = _FENCE.match(line)
+            if match:
+                fence = match.group(1)
+                start = number + 1
+        elif first in ('-', '*', '+') and _MARKDOWN_ITEM.match(line):
+            block = [line.rstrip()]
+            start = number
+
+    if fence is None and block and _looks_like_structure(block):
+        yield StructureBlock(heading, start, "list", block)
+
+
+def select_structure_block(lines: Iterable[str], heading: Optional[str] = None) -> StructureBlock:
+    """
+    Return the first structure block, optionally the first under a matching heading.
+
+    Scanning stops at the selected block, so the rest of the document is not read.
+
+    Args:
+        lines: Lines of the document
+        heading: Case-insensitive text the block's heading must contain
+
+    Raises:
+        StructureParseError: If no matching block exists
+    """
+    wanted = heading.lower() if heading else None
+    for block in find_structure_blocks(lines):
+        if wanted is None or (block.heading is not None and wanted in block.heading.lower()):
+            return block
+    under = f" under a heading matching '{heading}'" if heading else ""
+    raise StructureParseError(f"No structure block found in the Markdown document{under}")
+
+
+def _looks_like_structure(block: List[str]) -> bool:
+    """
+    True if most lines of a block name a single path and the block has some
+    shape of a tree: drawing characters, a directory slash or nesting.
+    """
+    total = path_like = 0
+    nested = False
+    indents = set()
+    for line in block:
+        if not line.strip():
+            continue
+        total += 1
+        prefix = _DRAWING.match(line).group(0)
+        name = _clean_name(_FORMATTING.sub('', line[len(prefix):]))
+        name = split_size_annotation(name)[0] if name.endswith(']') else name
+        if _PATH_LIKE.match(name):
+            path_like += 1
+        if not nested:
+            indents.add(len(prefix) - len(prefix.lstrip()))
+            nested = ('├' in prefix or '└' in prefix or '|' in prefix or line.rstrip().endswith('/')
+                      or len(indents) > 1)
+    return total >= 2 and nested and path_like >= total * MIN_PATH_SHARE
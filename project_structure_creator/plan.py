@@ -0,0 +1,462 @@
+"""
+Creation plans for Project Structure Creator
+
+A StructurePlan is the result of parsing a spec once and working out what
+has to happen on disk: the minimal set of directories to create (only the
+deepest ones; their ancestors are created with them) and the files with their
+planned content. The same plan can then be applied to any number of output
+roots without re-parsing or re-planning, e.g. one skeleton per tenant.
+
+A plan can also be split into disjoint partitions of balanced size, written
+to JSON files and applied independently, e.g. by several machines sharing a
+file system.
+"""
+
+import heapq
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from . import stats
+from .content import (COPIED, LINKED, Deduplicator, FileSpec, format_size_annotation,
+                      split_size_annotation, write_content)
+from .diff import index_entries
+from .expand import count_expansions, expand_braces
+from .main import _HAS_DIR_FD, StructureParseError, _DirFdCache, iter_structure
+from .throttle import OpScheduler, no_op
+
+
+class StructurePlan(NamedTuple):
+    """Directories and files to create, relative to an output root"""
+
+    dirs: List[str]
+    files: List[Tuple[str, Optional[FileSpec]]]
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.dirs or self.files)
+
+
+class Partition(NamedTuple):
+    """One share of a partitioned plan"""
+
+    index: int
+    count: int
+    shared_dirs: List[str]
+    plan: StructurePlan
+    entries: int
+
+
+class TargetResult(NamedTuple):
+    """Outcome of applying a plan to one output root"""
+
+    target: str
+    # Directories actually created, including missing ancestors of planned ones
+    dirs: int
+    files: int
+    skipped: int
+    seconds: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def build_plan(entries: Iterable[Tuple[str, bool]]) -> StructurePlan:
+    """
+    Work out the directories and files for parsed entries.
+
+    Brace patterns stay unexpanded and are expanded while the plan is
+    applied. Directories that are an ancestor of another planned directory
+    are dropped, since creating the deeper one creates them too.
+    """
+    index = index_entries(entries)
+    dirs = [path for path, is_dir in index.items() if is_dir]
+
+    # Sorted by components, a directory is redundant iff the next one lies inside it
+    ordered = sorted(dirs, key=lambda path: path.split("/"))
+    redundant = {
+        path for path, following in zip(ordered, ordered[1:])
+        if following.startswith(path + "/")
+    }
+    files = [split_size_annotation(path) for path, is_dir in index.items() if not is_dir]
+    return StructurePlan([path for path in dirs if path not in redundant], files)
+
+
+def plan_structure(structure_lines: Iterable[str]) -> StructurePlan:
+    """
+    Parse structure lines and build their plan.
+
+    Lines are parsed as a stream (see iter_structure), so a lazily read
+    spec is never held in memory as a whole; only its entries are.
+
+    Raises:
+        StructureParseError: If the structure cannot be parsed or is empty
+    """
+    # Parsed first, so the plan phase does not include parse time
+    entries = list(iter_structure(structure_lines))
+    with stats.phase('plan'):
+        plan = build_plan(entries)
+    if plan.is_empty:
+        raise StructureParseError("No valid structure found")
+    return plan
+
+
+def apply_plan(base_path: str, plan: StructurePlan, log: Optional[Callable[[str], None]] = None,
+               dedup: Optional[str] = None, scheduler: Optional[OpScheduler] = None) -> TargetResult:
+    """
+    Create a plan under one output root.
+
+    Args:
+        base_path: Output root
+        plan: Plan from build_plan or plan_structure
+        log: Optional callable receiving one message per created entry
+        dedup: Optional "hardlink" or "reflink", as for create_structure
+        scheduler: Optional OpScheduler, as for create_structure
+
+    Returns:
+        TargetResult with counts; errors are raised, not recorded
+
+    Raises:
+        OSError: If file/directory creation fails
+    """
+    started = time.perf_counter()
+    recorder = stats.current()
+    deduplicator = Deduplicator(dedup) if dedup else None
+    op = scheduler.op if scheduler is not None else no_op
+    dirs = files = skipped = written = 0
+
+    for pattern in plan.dirs:
+        for path in expand_braces(pattern):
+            full_path = os.path.join(base_path, path)
+            with op(), stats.phase('mkdir'):
+                created = _makedirs(full_path)
+            if not created:
+                continue
+            dirs += created
+            if recorder is not None:
+                recorder.count('mkdir', created)
+            if log:
+                log(f"Created directory: {full_path}")
+
+    dir_fds = _DirFdCache(recorder) if _HAS_DIR_FD else None
+    try:
+        for pattern, spec in plan.files:
+            for path in expand_braces(pattern):
+                full_path = os.path.join(base_path, path)
+                deduplicate = deduplicator is not None and deduplicator.applies_to(spec)
+
+                with op(), stats.phase('write'):
+                    outcome = deduplicator.link(full_path, spec) if deduplicate else None
+                    if outcome is None:
+                        created = _create_planned_file(full_path, spec, dir_fds)
+                if outcome is None:
+                    if created and deduplicate:
+                        deduplicator.remember(spec, full_path)
+                else:
+                    created = outcome in (LINKED, COPIED)
+
+                if not created:
+                    skipped += 1
+                    if log:
+                        log(f"File already exists, skipped: {full_path}")
+                    continue
+                files += 1
+                if outcome != LINKED:
+                    written += spec.size if spec else 0
+                if log:
+                    log(f"{'Linked' if outcome == LINKED else 'Created'} file: {full_path}")
+    finally:
+        if dir_fds is not None:
+            dir_fds.close()
+
+    if recorder is not None:
+        recorder.count('dirs', dirs)
+        recorder.count('files', files)
+        recorder.count('skipped', skipped)
+        recorder.count('bytes', written)
+        recorder.count('entries', dirs + files + skipped)
+        if deduplicator is not None:
+            recorder.count('linked', deduplicator.linked)
+            recorder.count('bytes_saved', deduplicator.bytes_saved)
+    return TargetResult(base_path, dirs, files, skipped, time.perf_counter() - started)
+
+
+def _makedirs(path: str) -> int:
+    """
+    os.makedirs(path, exist_ok=True) that returns how many directories it
+    created, counting the missing ancestors of path as well
+    """
+    try:
+        os.mkdir(path)
+        return 1
+    except FileExistsError:
+        if not os.path.isdir(path):
+            raise
+        return 0
+    except FileNotFoundError:
+        parent = os.path.dirname(path)
+        if not parent or parent == path:
+            raise
+    created = _makedirs(parent)
+    try:
+        os.mkdir(path)
+    except FileExistsError:
+        # Created concurrently, e.g. by another worker sharing the root
+        if not os.path.isdir(path):
+            raise
+        return created
+    return created + 1
+
+
+def _create_planned_file(full_path: str, spec: Optional[FileSpec], dir_fds: Optional[_DirFdCache]) -> bool:
+    """Create one file whose parent directory already exists"""
+    if dir_fds is not None:
+        dir_path, name = os.path.split(full_path)
+        return dir_fds.create_file(dir_path, name, spec)
+    try:
+        fd = os.open(full_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    except FileExistsError:
+        return False
+    try:
+        if spec is not None:
+            write_content(fd, spec)
+    finally:
+        os.close(fd)
+    return True
+
+
+def create_structure_many(targets: Iterable[str], structure_lines: Iterable[str],
+                          max_workers: Optional[int] = None, dedup: Optional[str] = None,
+                          scheduler: Optional[OpScheduler] = None,
+                          on_result: Optional[Callable[[TargetResult], None]] = None) -> List[TargetResult]:
+    """
+    Parse and plan a structure once, then create it under many output roots.
+
+    Targets are materialized concurrently on a thread pool; a failure in one
+    target is recorded in its TargetResult and does not stop the others.
+
+    Args:
+        targets: Output roots
+        structure_lines: Any iterable of lines
+        max_workers: Number of targets created concurrently (default: min(32, cpus + 4))
+        dedup: Optional "hardlink" or "reflink"; links never cross targets
+        scheduler: Optional OpScheduler shared by all targets, so its limits
+            apply to the fan-out as a whole
+        on_result: Optional callable invoked as each target finishes; calls
+            are serialized, so it may print without further locking
+
+    Returns:
+        One TargetResult per target, in the order given
+
+    Raises:
+        StructureParseError: If the structure cannot be parsed
+    """
+    targets = list(targets)
+    plan = plan_structure(structure_lines)
+    report_lock = threading.Lock()
+
+    def run(target: str) -> TargetResult:
+        started = time.perf_counter()
+        try:
+            result = apply_plan(target, plan, dedup=dedup, scheduler=scheduler)
+        except Exception as e:
+            result = TargetResult(target, 0, 0, 0, time.perf_counter() - started, str(e))
+        if on_result is not None:
+            with report_lock:
+                on_result(result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="structure-fanout") as pool:
+        return list(pool.map(run, targets))
+
+
+# Version of the partition file format
+PARTITION_FORMAT = 1
+
+
+def partition_plan(entries: Iterable[Tuple[str, bool]], count: int) -> List[Partition]:
+    """
+    Split parsed entries into disjoint partitions of balanced size.
+
+    Whole subtrees are assigned to partitions, so no two partitions create
+    the same directory. A subtree larger than an even share is divided: a
+    brace pattern in its name is expanded into separate subtrees, otherwise
+    it is split into its children and becomes part of the shared directory
+    set that every partition creates first (idempotently). Sizes count
+    entries after brace expansion.
+
+    Args:
+        entries: Parsed entries
+        count: Number of partitions
+
+    Returns:
+        count Partitions, some possibly empty if there are too few subtrees
+
+    Raises:
+        ValueError: If count is less than 1
+    """
+    if count < 1:
+        raise ValueError("Number of partitions must be at least 1")
+    tree = _PartitionTree(index_entries(entries))
+    roots = tree.children[""]
+    share = sum(tree.weights[path] for path in roots) / count
+
+    # Divide the heaviest subtree until every subtree fits a share
+    shared = []
+    heap = [(-tree.weights[path], path) for path in roots]
+    heapq.heapify(heap)
+    units = []
+    while heap:
+        weight, path = heapq.heappop(heap)
+        if -weight <= share:
+            units.append((-weight, path))
+            continue
+        expanded = tree.expand(path)
+        if expanded is None and tree.children.get(path):
+            shared.append(path)
+            expanded = tree.children[path]
+        if expanded is None:
+            units.append((-weight, path))
+            continue
+        for child in expanded:
+            heapq.heappush(heap, (-tree.weights[child], child))
+
+    # Longest subtree first onto the lightest partition
+    loads = [(0, number) for number in range(count)]
+    members: List[List[Tuple[str, bool]]] = [[] for _ in range(count)]
+    for weight, path in sorted(units, key=lambda unit: -unit[0]):
+        load, number = heapq.heappop(loads)
+        members[number].extend(tree.subtree(path))
+        heapq.heappush(loads, (load + weight, number))
+
+    shared_dirs = build_plan((path, True) for path in shared).dirs
+    # Shared directories and their ancestors, all created by apply_partition first
+    created = set()
+    for path in shared_dirs:
+        while path and path not in created:
+            created.add(path)
+            path = path.rpartition("/")[0]
+    partitions = []
+    for number in range(count):
+        plan = build_plan(members[number])
+        # A unit's parents are implied in its plan; leave them to the shared directories
+        plan = plan._replace(dirs=[path for path in plan.dirs if path not in created])
+        partitions.append(Partition(number, count, shared_dirs, plan,
+                                    sum(count_expansions(path) for path, is_dir in members[number])))
+    return partitions
+
+
+# Largest brace expansion partition_plan splits into separate subtrees
+MAX_SPLIT_EXPANSIONS = 4096
+
+
+class _PartitionTree:
+    """Indexed entries as a tree with expanded entry counts per subtree"""
+
+    def __init__(self, index: Dict[str, bool]):
+        self.kinds = dict(index)
+        self.weights: Dict[str, int] = dict.fromkeys(index, 0)
+        # Children of every directory, "" being the root
+        self.children: Dict[str, List[str]] = {"": []}
+        for path, is_dir in index.items():
+            self.children[path.rpartition("/")[0]].append(path)
+            if is_dir:
+                self.children[path] = []
+            expansions = count_expansions(path)
+            while path:
+                self.weights[path] += expansions
+                path = path.rpartition("/")[0]
+
+    def subtree(self, path: str) -> Iterable[Tuple[str, bool]]:
+        """Entries of a subtree, parents first"""
+        pending = [path]
+        while pending:
+            path = pending.pop()
+            yield path, self.kinds[path]
+            pending.extend(reversed(self.children.get(path, ())))
+
+    def expand(self, path: str) -> Optional[List[str]]:
+        """
+        Replace a subtree whose name is a brace pattern by one subtree per
+        expansion, returning the new roots, or None if it cannot be split.
+        """
+        parent, _, name = path.rpartition("/")
+        splits = count_expansions(name)
+        if splits < 2 or splits > MAX_SPLIT_EXPANSIONS:
+            return None
+        prefix = parent + "/" if parent else ""
+        roots = [prefix + expanded for expanded in expand_braces(name)]
+        if any(root in self.kinds for root in roots):
+            return None  # an expansion is also listed literally
+
+        members = [entry for entry, is_dir in self.subtree(path)]
+        for root in roots:
+            for member in members:
+                copy = root + member[len(path):]
+                self.kinds[copy] = self.kinds[member]
+                self.weights[copy] = self.weights[member] // splits
+                if member in self.children:
+                    self.children[copy] = [root + child[len(path):] for child in self.children[member]]
+        return roots
+
+
+def write_partition(partition: Partition, path: str) -> None:
+    """Write a partition as JSON for apply_partition on another machine"""
+    files = [
+        pattern + (_annotation(spec) if spec is not None else "")
+        for pattern, spec in partition.plan.files
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "format": PARTITION_FORMAT,
+            "index": partition.index,
+            "count": partition.count,
+            "entries": partition.entries,
+            "shared_dirs": partition.shared_dirs,
+            "dirs": partition.plan.dirs,
+            "files": files,
+        }, f, indent=1)
+
+
+def read_partition(path: str) -> Partition:
+    """
+    Read a partition written by write_partition.
+
+    Raises:
+        StructureParseError: If the file is not a partition file
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise StructureParseError(f"Invalid partition file '{path}': {e}")
+    if not isinstance(data, dict) or data.get("format") != PARTITION_FORMAT:
+        raise StructureParseError(f"'{path}' is not a partition file (format {PARTITION_FORMAT})")
+    plan = StructurePlan(data["dirs"], [split_size_annotation(file) for file in data["files"]])
+    return Partition(data["index"], data["count"], data["shared_dirs"], plan, data["entries"])
+
+
+def apply_partition(base_path: str, partition: Partition, log: Optional[Callable[[str], None]] = None,
+                    dedup: Optional[str] = None, scheduler: Optional[OpScheduler] = None) -> TargetResult:
+    """
+    Create the shared directories and then one partition under base_path.
+
+    Partitions of the same plan may be applied concurrently, from any number
+    of processes or machines, without further coordination.
+
+    Raises:
+        OSError: If file/directory creation fails
+    """
+    started = time.perf_counter()
+    shared = apply_plan(base_path, StructurePlan(partition.shared_dirs, []), log, scheduler=scheduler)
+    result = apply_plan(base_path, partition.plan, log, dedup, scheduler)
+    return result._replace(dirs=result.dirs + shared.dirs, seconds=time.perf_counter() - started)
+
+
+def _annotation(spec: FileSpec) -> str:
+    return format_size_annotation(spec.size, spec.mode, spec.pattern.hex() if spec.mode == "fill" else None)
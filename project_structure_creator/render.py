@@ -0,0 +1,323 @@
+"""
+Output formats for Project Structure Creator
+
+Renders parsed (path, is_directory) entries back into the text formats the
+parser understands, so structures can be converted, compared and merged.
+
+render_structure builds the whole tree first, so entries may arrive in any
+order. render_structure_stream prints entries as they arrive, in constant
+memory, and expects them grouped by directory as the parsers produce them.
+"""
+
+import json
+import re
+from collections import OrderedDict, deque
+from typing import Iterable, Iterator, List, Tuple
+
+# Supported output format names, in the order shown by the CLI
+OUTPUT_FORMATS = ("tree", "indented", "markdown", "json", "yaml", "flat")
+
+
+class _Node:
+    """Directory or file in a rendered structure"""
+
+    __slots__ = ("is_dir", "children")
+
+    def __init__(self, is_dir: bool):
+        self.is_dir = is_dir
+        self.children = OrderedDict()
+
+
+def split_path(path: str) -> List[str]:
+    """Split a parsed path into its components, accepting either separator"""
+    return [part for part in re.split(r'[\\/]', path) if part]
+
+
+def build_tree(entries: Iterable[Tuple[str, bool]]) -> "OrderedDict[str, _Node]":
+    """Nest entries by path component, adding any missing parent directories"""
+    roots = OrderedDict()
+    for path, is_dir in entries:
+        parts = split_path(path)
+        if not parts:
+            continue
+        level = roots
+        for part in parts[:-1]:
+            node = level.get(part)
+            if node is None:
+                node = level[part] = _Node(True)
+            node.is_dir = True
+            level = node.children
+        node = level.get(parts[-1])
+        if node is None:
+            level[parts[-1]] = _Node(is_dir)
+        else:
+            node.is_dir = node.is_dir or is_dir
+    return roots
+
+
+def render_structure(entries: Iterable[Tuple[str, bool]], fmt: str = "tree") -> Iterator[str]:
+    """
+    Render entries in one of OUTPUT_FORMATS.
+
+    Args:
+        entries: Iterable of (path, is_directory) tuples
+        fmt: Output format name
+
+    Yields:
+        Output lines without trailing newlines
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if fmt == "flat":
+        # No nesting needed, so entries are passed straight through
+        for path, is_dir in entries:
+            yield "/".join(split_path(path)) + ("/" if is_dir else "")
+        return
+
+    renderer = _RENDERERS.get(fmt)
+    if renderer is None:
+        raise ValueError(f"Unsupported output format '{fmt}' (choose from {', '.join(OUTPUT_FORMATS)})")
+    yield from renderer(build_tree(entries))
+
+
+def render_structure_stream(entries: Iterable[Tuple[str, bool]], fmt: str = "tree",
+                            lookahead: int = 1024) -> Iterator[str]:
+    """
+    Render entries in one of OUTPUT_FORMATS while they are still being parsed.
+
+    Output starts with the first entry and memory stays constant. Entries
+    must list each directory's contents together, as iter_structure yields
+    them with grouped=True; missing parent directories are added.
+
+    In the tree format, whether an entry is the last child of its directory
+    is decided within the next ``lookahead`` entries. If a subtree is larger
+    than that, the entry is drawn with "├──" even if no sibling follows. The
+    other formats need only the next entry and always match render_structure.
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if fmt == "flat":
+        yield from render_structure(entries, fmt)
+        return
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format '{fmt}' (choose from {', '.join(OUTPUT_FORMATS)})")
+    nodes = iter_nodes(entries)
+    if fmt == "tree":
+        yield from _stream_tree(nodes, lookahead)
+    elif fmt == "indented":
+        for depth, name, is_dir in nodes:
+            yield f"{'    ' * depth}{name}{'/' if is_dir else ''}"
+    elif fmt == "markdown":
+        for depth, name, is_dir in nodes:
+            yield f"{'  ' * depth}- {name}{'/' if is_dir else ''}"
+    elif fmt == "json":
+        yield from _stream_json(nodes)
+    else:
+        yield from _stream_yaml(nodes)
+
+
+def iter_nodes(entries: Iterable[Tuple[str, bool]]) -> Iterator[Tuple[int, str, bool]]:
+    """
+    Turn grouped entries into (depth, name, is_directory) nodes in display order.
+
+    Parent directories that were not listed are emitted before their first
+    child, and a directory listed again while it is still open is skipped.
+    """
+    open_dirs: List[str] = []
+    for path, is_dir in entries:
+        parts = split_path(path)
+        if not parts:
+            continue
+        common = 0
+        limit = min(len(open_dirs), len(parts))
+        while common < limit and open_dirs[common] == parts[common]:
+            common += 1
+        if common == len(parts) and is_dir:
+            del open_dirs[common:]
+            continue
+        for depth in range(common, len(parts) - 1):
+            yield depth, parts[depth], True
+        yield len(parts) - 1, parts[-1], is_dir
+        open_dirs = parts if is_dir else parts[:-1]
+
+
+def _with_next_depth(nodes: Iterator[Tuple[int, str, bool]]) -> Iterator[Tuple[int, str, bool, int]]:
+    """Pair every node with the depth of the node after it (-1 at the end)"""
+    previous = next(nodes, None)
+    for node in nodes:
+        yield previous + (node[0],)
+        previous = node
+    if previous is not None:
+        yield previous + (-1,)
+
+
+def _stream_tree(nodes: Iterator[Tuple[int, str, bool]], lookahead: int) -> Iterator[str]:
+    # Window of [depth, label, is_last] records; is_last is None until known
+    window = deque()
+    # Latest record at every depth of the current path, for last-child detection
+    latest: List[list] = []
+    # Line prefix for nodes at each depth, from the emitted ancestors
+    prefixes = [""]
+
+    def emit(record):
+        depth, label, last = record
+        if depth == 0:
+            line = label
+        else:
+            line = f"{prefixes[depth]}{'└── ' if last else '├── '}{label}"
+        del prefixes[depth + 1:]
+        prefixes.append("" if depth == 0 else prefixes[depth] + ("    " if last else "│   "))
+        return line
+
+    for depth, name, is_dir in nodes:
+        # Deeper subtrees are finished: their latest records were last children
+        for record in latest[depth + 1:]:
+            if record[2] is None:
+                record[2] = True
+        del latest[depth + 1:]
+        # The previous record at this depth has a sibling after all
+        if len(latest) > depth:
+            if latest[depth][2] is None:
+                latest[depth][2] = False
+        else:
+            latest.extend([None] * (depth + 1 - len(latest)))
+        record = [depth, name + "/" if is_dir else name, None]
+        latest[depth] = record
+        window.append(record)
+
+        while window and (window[0][2] is not None or len(window) > lookahead):
+            record = window.popleft()
+            if record[2] is None:
+                # Undecided within the lookahead: assume a sibling follows
+                record[2] = False
+            yield emit(record)
+
+    for record in window:
+        if record[2] is None:
+            record[2] = True
+        yield emit(record)
+
+
+def _stream_json(nodes: Iterator[Tuple[int, str, bool]]) -> Iterator[str]:
+    # Same layout as json.dumps(indent=2) of the mapping _render_json builds
+    first = True
+    for depth, name, is_dir, next_depth in _with_next_depth(nodes):
+        if first:
+            yield "{"
+            first = False
+        indent = "  " * (depth + 1)
+        key = json.dumps(name, ensure_ascii=False)
+        if is_dir and next_depth > depth:
+            yield f"{indent}{key}: {{"
+            continue
+        value = "[]" if is_dir else json.dumps(_file_value(name), ensure_ascii=False)
+        yield f"{indent}{key}: {value}{',' if next_depth == depth else ''}"
+        # Close the directories this entry ends, down to the next entry's level
+        for level in range(depth - 1, max(next_depth, 0) - 1, -1):
+            yield f"{'  ' * (level + 1)}}}{',' if level == next_depth else ''}"
+    yield "{}" if first else "}"
+
+
+def _stream_yaml(nodes: Iterator[Tuple[int, str, bool]]) -> Iterator[str]:
+    for depth, name, is_dir, next_depth in _with_next_depth(nodes):
+        indent = "  " * depth
+        key = json.dumps(name, ensure_ascii=False)
+        if not is_dir:
+            yield f"{indent}{key}: {json.dumps(_file_value(name), ensure_ascii=False)}"
+        elif next_depth > depth:
+            yield f"{indent}{key}:"
+        else:
+            yield f"{indent}{key}: []"
+
+
+def _render_tree(roots) -> Iterator[str]:
+    def walk(children, prefix):
+        names = list(children)
+        for i, name in enumerate(names):
+            node = children[name]
+            last = i == len(names) - 1
+            yield f"{prefix}{'└── ' if last else '├── '}{_label(name, node)}"
+            if node.children:
+                yield from walk(node.children, prefix + ("    " if last else "│   "))
+
+    for name, node in roots.items():
+        yield _label(name, node)
+        yield from walk(node.children, "")
+
+
+def _render_indented(roots, unit: str = "    ", bullet: str = "") -> Iterator[str]:
+    def walk(children, depth):
+        for name, node in children.items():
+            yield f"{unit * depth}{bullet}{_label(name, node)}"
+            yield from walk(node.children, depth + 1)
+
+    yield from walk(roots, 0)
+
+
+def _render_markdown(roots) -> Iterator[str]:
+    yield from _render_indented(roots, unit="  ", bullet="- ")
+
+
+def _render_json(roots) -> Iterator[str]:
+    text = json.dumps(_to_mapping(roots), indent=2, ensure_ascii=False)
+    yield from text.split("\n")
+
+
+def _render_yaml(roots) -> Iterator[str]:
+    # Hand-rolled so YAML output does not require pyyaml; JSON-style quoted
+    # scalars are valid YAML and keep unusual names safe.
+    def walk(children, depth):
+        indent = "  " * depth
+        for name, node in children.items():
+            key = json.dumps(name, ensure_ascii=False)
+            if not node.is_dir:
+                yield f"{indent}{key}: {json.dumps(_file_value(name), ensure_ascii=False)}"
+            elif not node.children:
+                yield f"{indent}{key}: []"
+            else:
+                yield f"{indent}{key}:"
+                yield from walk(node.children, depth + 1)
+
+    yield from walk(roots, 0)
+
+
+def _to_mapping(children) -> "OrderedDict":
+    """Convert nodes to the JSON shape understood by the JSON parser"""
+    mapping = OrderedDict()
+    for name, node in children.items():
+        if not node.is_dir:
+            mapping[name] = _file_value(name)
+        elif node.children:
+            mapping[name] = _to_mapping(node.children)
+        else:
+            mapping[name] = []
+    return mapping
+
+
+def _file_value(name: str) -> str:
+    """
+    JSON/YAML value of a file. The parsers read an empty value as a file
+    only when the name contains a dot, so other files (Makefile, LICENSE)
+    repeat their name, which the parsers read as the file itself.
+    """
+    return "" if "." in name else name
+
+
+def _label(name: str, node: _Node) -> str:
+    return name + "/" if node.is_dir else name
+
+
+_RENDERERS = {
+    "tree": _render_tree,
+    "indented": _render_indented,
+    "markdown": _render_markdown,
+    "json": _render_json,
+    "yaml": _render_yaml,
+}
+
+
+def normalize_path(path: str) -> str:
+    """Return a separator-independent key for a parsed path"""
+    return "/".join(split_path(path))
@@ -0,0 +1,159 @@
+"""
+Spec input for Project Structure Creator
+
+Reads structure specs as a lazy stream of lines:
+
+- gzip, bzip2 and xz input is recognised by its magic bytes (not the file
+  name) and decompressed on the fly, so a compressed spec is never expanded
+  to disk or into memory as a whole.
+- Everything else is read as a buffered text stream. Files are not
+  memory-mapped: a spec that shrinks while mapped (e.g. being edited under
+  --watch) would crash the process with SIGBUS.
+
+The lines of a file report whether it is a regular file, so parsers know
+they may read ahead without waiting on a producer (see SpecLines). For
+viewers that page through a large spec, index_lines records where blocks of
+lines start so read_line_block can seek straight to one.
+"""
+
+import io
+import os
+import stat
+from contextlib import contextmanager
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+# Magic bytes of the supported compression formats
+COMPRESSION_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+)
+
+_MAGIC_LENGTH = max(len(magic) for magic, _ in COMPRESSION_MAGIC)
+
+
+def detect_compression(head: bytes) -> Optional[str]:
+    """Return "gzip", "bz2" or "xz" for the leading bytes of a stream, else None"""
+    for magic, name in COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+class SpecLines:
+    """
+    Iterator over the lines of a spec file.
+
+    Behaves like the generator it wraps; seekable() is True for regular
+    files, whose content is complete on disk, and False for FIFOs and other
+    special files that are written by another process while being read.
+    """
+
+    def __init__(self, path: str):
+        self._regular = stat.S_ISREG(os.stat(path).st_mode)
+        self._lines = _read_file_lines(path)
+
+    def __iter__(self) -> "SpecLines":
+        return self
+
+    def __next__(self) -> str:
+        return next(self._lines)
+
+    def seekable(self) -> bool:
+        return self._regular
+
+    def close(self) -> None:
+        self._lines.close()
+
+
+def read_lines(path: str) -> SpecLines:
+    """
+    Lazily read the lines of a spec file, decompressing it if needed.
+
+    Returns:
+        SpecLines yielding lines without line endings
+
+    Raises:
+        OSError: If the file cannot be read or its compression is unsupported
+    """
+    return SpecLines(path)
+
+
+def _read_file_lines(path: str) -> Iterator[str]:
+    with _open_spec(path) as f:
+        yield from stream_lines(f)
+
+
+def index_lines(path: str, every: int) -> Tuple[int, List[int]]:
+    """
+    Count the lines of a spec file and note where every `every`-th one starts.
+
+    Offsets are positions in the decompressed content, for read_line_block.
+
+    Returns:
+        Number of lines, and the offsets of lines 0, every, 2 * every, ...
+    """
+    offsets = []
+    count = position = 0
+    with _open_spec(path) as f:
+        for raw in f:
+            if count % every == 0:
+                offsets.append(position)
+            count += 1
+            position += len(raw)
+    return count, offsets or [0]
+
+
+def read_line_block(path: str, offset: int, count: int) -> List[str]:
+    """Read up to count lines of a spec file, starting at an offset from index_lines"""
+    with _open_spec(path) as f:
+        f.seek(offset)
+        return [raw.decode('utf-8').rstrip('\r\n') for raw in islice(f, count)]
+
+
+@contextmanager
+def _open_spec(path: str) -> Iterator[BinaryIO]:
+    """Open a spec file as a binary stream of its decompressed content"""
+    with open(path, 'rb') as f:
+        compression = detect_compression(f.peek(_MAGIC_LENGTH)[:_MAGIC_LENGTH])
+        if compression is None:
+            yield f
+            return
+        with _decompressor(f, compression) as decompressed:
+            yield decompressed
+
+
+def read_stream_lines(stream: BinaryIO) -> Iterator[str]:
+    """Lazily read the lines of a binary stream such as stdin, decompressing it if needed"""
+    head = stream.peek(_MAGIC_LENGTH)[:_MAGIC_LENGTH] if hasattr(stream, "peek") else b""
+    compression = detect_compression(head)
+    if compression is not None:
+        stream = _decompressor(stream, compression)
+    yield from stream_lines(stream)
+
+
+def stream_lines(stream: BinaryIO) -> Iterator[str]:
+    """Decode a binary stream as UTF-8 text lines"""
+    text = io.TextIOWrapper(stream, encoding='utf-8')
+    try:
+        for line in text:
+            yield line.rstrip('\n')
+    finally:
+        # The caller owns the underlying stream
+        text.detach()
+
+
+def _decompressor(stream: BinaryIO, compression: str) -> BinaryIO:
+    """Wrap a binary stream in a streaming decompressor"""
+    try:
+        if compression == "gzip":
+            import gzip
+            return gzip.GzipFile(fileobj=stream, mode='rb')
+        if compression == "bz2":
+            import bz2
+            return bz2.BZ2File(stream, mode='rb')
+        import lzma
+        return lzma.LZMAFile(stream, mode='rb')
+    except ImportError:
+        raise OSError(f"This Python was built without {compression} support")
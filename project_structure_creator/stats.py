@@ -0,0 +1,249 @@
+"""
+Instrumentation for Project Structure Creator
+
+Records per-phase wall time, file system call counts and throughput for
+parsing and structure creation. Recording is off by default: while disabled,
+phase() hands out a shared no-op context manager and current() returns None,
+so instrumented code pays a single attribute lookup per call site. With
+tracing on, every timed call is also kept as a span with its thread and
+start time, up to MAX_TRACE_SPANS, for write_chrome_trace.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Counters tracked for every run, in report order
+COUNTERS = ("mkdir", "stat", "open", "entries", "dirs", "files", "skipped", "bytes", "linked", "bytes_saved")
+
+# Spans kept for a trace; later calls are still summed into their phase
+MAX_TRACE_SPANS = 100000
+
+
+class _NullPhase:
+    """No-op context manager used while instrumentation is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """Context manager timing one occurrence of a phase"""
+
+    __slots__ = ("stats", "name", "start")
+
+    def __init__(self, stats: "StructureStats", name: str):
+        self.stats = stats
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add_time(self.name, time.perf_counter() - self.start, self.start)
+        return False
+
+
+class StructureStats:
+    """Collected timings and counters for one run"""
+
+    def __init__(self, trace: bool = False):
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.counters: Dict[str, int] = {name: 0 for name in COUNTERS}
+        # name -> [total seconds, calls, first start]
+        self.phases: Dict[str, List[float]] = {}
+        # (name, thread ident, start, seconds) per timed call while tracing
+        self.spans: Optional[List[Tuple[str, int, float, float]]] = [] if trace else None
+        self.dropped_spans = 0
+        # Thread ident -> name, for the threads that recorded spans
+        self.threads: Dict[int, str] = {threading.get_ident(): threading.current_thread().name}
+        self._lock = threading.Lock()
+
+    def phase(self, name: str) -> _Phase:
+        """Time a block of code under the given phase name"""
+        return _Phase(self, name)
+
+    def add_time(self, name: str, seconds: float, start: Optional[float] = None) -> None:
+        """Accumulate wall time for a phase"""
+        if start is None:
+            start = time.perf_counter() - seconds
+        with self._lock:
+            record = self.phases.get(name)
+            if record is None:
+                self.phases[name] = [seconds, 1, start]
+            else:
+                record[0] += seconds
+                record[1] += 1
+            if self.spans is not None:
+                self._add_span(name, start, seconds)
+
+    def _add_span(self, name: str, start: float, seconds: float) -> None:
+        """Keep one timed call for the trace; the caller holds the lock"""
+        if len(self.spans) >= MAX_TRACE_SPANS:
+            self.dropped_spans += 1
+            return
+        ident = threading.get_ident()
+        if ident not in self.threads:
+            self.threads[ident] = threading.current_thread().name
+        self.spans.append((name, ident, start, seconds))
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increment a counter"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def timed_iter(self, name: str, iterable: Iterable) -> Iterator:
+        """
+        Wrap an iterator, charging the time spent producing each item to a phase.
+
+        Used for streamed parsing, where parsing and creation interleave and a
+        single enclosing phase would measure both.
+        """
+        iterator = iter(iterable)
+        perf_counter = time.perf_counter
+        total = 0.0
+        calls = 0
+        first = perf_counter()
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    total += perf_counter() - start
+                    return
+                seconds = perf_counter() - start
+                total += seconds
+                calls += 1
+                if self.spans is not None:
+                    with self._lock:
+                        self._add_span(name, start, seconds)
+                yield item
+        finally:
+            with self._lock:
+                record = self.phases.setdefault(name, [0.0, 0, first])
+                record[0] += total
+                record[1] += calls
+
+    def finish(self) -> None:
+        """Mark the end of the run"""
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        """Wall time of the run in seconds"""
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the collected data as plain JSON-serializable values"""
+        elapsed = self.elapsed
+        entries = self.counters.get("entries", 0)
+        return {
+            "elapsed_seconds": elapsed,
+            "entries_per_second": entries / elapsed if elapsed > 0 else 0.0,
+            "counters": dict(self.counters),
+            "phases": {
+                name: {"seconds": record[0], "calls": int(record[1])}
+                for name, record in sorted(self.phases.items(), key=lambda item: item[1][2])
+            },
+        }
+
+    def format_report(self) -> str:
+        """Return a human readable summary"""
+        data = self.to_dict()
+        lines = [
+            "📊 Statistics:",
+            f"  Total time:     {data['elapsed_seconds'] * 1000:.1f} ms",
+            f"  Entries/s:      {data['entries_per_second']:.0f}",
+        ]
+        for name in COUNTERS:
+            lines.append(f"  {name + ':':<15} {data['counters'].get(name, 0)}")
+        if data["phases"]:
+            lines.append("  Phases:")
+            width = max(len(name) for name in data["phases"])
+            for name, phase in data["phases"].items():
+                lines.append(f"    {name:<{width}}  {phase['seconds'] * 1000:9.1f} ms  ({phase['calls']} calls)")
+        return "\n".join(lines)
+
+    def write_json(self, path: str) -> None:
+        """Write the collected data as JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def write_chrome_trace(self, path: str) -> None:
+        """
+        Write the recorded spans in Chrome trace event format.
+
+        The file loads in chrome://tracing, Perfetto and speedscope. Every
+        timed call is one event at the time it ran, on a track per thread,
+        nested under the "run" span on the thread that started recording.
+        Only the first MAX_TRACE_SPANS calls are kept; the number dropped is
+        in the run's args. Without tracing (enable(trace=False)) there are
+        no spans, and the run's args hold the per-phase totals instead.
+        """
+        pid = os.getpid()
+        tids = {ident: tid for tid, ident in enumerate(self.threads)}
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": self.threads[ident]}}
+            for ident, tid in tids.items()
+        ]
+        args: Dict[str, Any] = dict(self.counters)
+        if self.spans is None:
+            args["phases"] = self.to_dict()["phases"]
+        else:
+            args["dropped_spans"] = self.dropped_spans
+        events.append({
+            "name": "run", "ph": "X", "pid": pid, "tid": 0,
+            "ts": 0.0, "dur": self.elapsed * 1e6, "args": args,
+        })
+        for name, ident, start, seconds in self.spans or ():
+            events.append({
+                "name": name, "ph": "X", "pid": pid, "tid": tids[ident],
+                "ts": (start - self.started) * 1e6, "dur": seconds * 1e6,
+            })
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+_current: Optional[StructureStats] = None
+
+
+def enable(trace: bool = False) -> StructureStats:
+    """Start recording into a fresh StructureStats and return it; trace keeps spans too"""
+    global _current
+    _current = StructureStats(trace)
+    return _current
+
+
+def disable() -> Optional[StructureStats]:
+    """Stop recording and return the finished stats, if any"""
+    global _current
+    stats, _current = _current, None
+    if stats is not None:
+        stats.finish()
+    return stats
+
+
+def current() -> Optional[StructureStats]:
+    """Return the active StructureStats, or None while disabled"""
+    return _current
+
+
+def phase(name: str):
+    """Time a block under the given phase name when recording is enabled"""
+    stats = _current
+    if stats is None:
+        return _NULL_PHASE
+    return stats.phase(name)
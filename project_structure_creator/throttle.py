@@ -0,0 +1,156 @@
+"""
+I/O throttling for Project Structure Creator
+
+An OpScheduler sits in front of every file system operation issued while a
+structure is created (one operation per directory or file). It combines:
+
+- a token bucket capping operations per second, with a small burst,
+- a cap on operations in flight across threads (fan-out, asyncio API,
+  daemon workers), and
+- optional latency feedback: when the moving average of operation latency
+  rises above a target the rate is cut multiplicatively, and it recovers
+  additively towards the configured maximum once latency drops again.
+
+This keeps the load on shared storage (e.g. NFS) predictable at the cost of
+raw speed. Without a scheduler the creation paths are not throttled at all.
+"""
+
+import threading
+import time
+from typing import Optional
+
+from . import stats
+
+# Latency feedback is applied once per this many operations
+ADJUST_EVERY = 32
+# Weight of the newest sample in the latency moving average
+LATENCY_SMOOTHING = 0.1
+# Rate multiplier applied when latency is above target
+BACKOFF = 0.7
+# Fraction of the maximum rate regained per adjustment while latency is low
+RECOVERY = 0.05
+
+
+class _NullOp:
+    """No-op context manager used when no scheduler is configured"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_OP = _NullOp()
+
+
+def no_op() -> _NullOp:
+    """Context manager factory standing in for OpScheduler.op"""
+    return _NULL_OP
+
+
+class _Op:
+    """Context manager admitting one operation and measuring its latency"""
+
+    __slots__ = ("scheduler", "start")
+
+    def __init__(self, scheduler: "OpScheduler"):
+        self.scheduler = scheduler
+        self.start = 0.0
+
+    def __enter__(self):
+        scheduler = self.scheduler
+        scheduler.acquire()
+        if scheduler._slots is not None:
+            scheduler._slots.acquire()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        latency = time.perf_counter() - self.start
+        scheduler = self.scheduler
+        if scheduler._slots is not None:
+            scheduler._slots.release()
+        scheduler.record(latency)
+        return False
+
+
+class OpScheduler:
+    """
+    Thread-safe token bucket and concurrency limit for file system operations.
+
+    Args:
+        rate: Maximum operations per second (None: unlimited)
+        burst: Operations allowed back to back before the rate applies
+            (default: a tenth of a second's worth, at least 1)
+        max_concurrency: Maximum operations in flight across all threads
+        target_latency: Average operation latency in seconds to steer
+            towards by lowering the rate; requires a rate
+        min_rate: Lowest rate latency feedback may back off to
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None,
+                 max_concurrency: Optional[int] = None, target_latency: Optional[float] = None,
+                 min_rate: float = 1.0):
+        if rate is not None and rate <= 0:
+            raise ValueError("Operation rate must be positive")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+        if target_latency is not None and rate is None:
+            raise ValueError("A target latency needs an operation rate to adjust")
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate) if rate is not None else min_rate
+        self.burst = float(burst if burst is not None else max(1, int(rate / 10))) if rate is not None else 0.0
+        self.target_latency = target_latency
+        self.latency: Optional[float] = None
+        self.ops = 0
+        self.waited = 0.0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+
+    def op(self) -> _Op:
+        """Context manager wrapping one file system operation"""
+        return _Op(self)
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until the bucket allows it"""
+        if self.rate is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token even if it is not there yet, so waiters queue in order
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += delay
+        if delay > 0:
+            recorder = stats.current()
+            if recorder is not None:
+                recorder.add_time('throttle', delay, time.perf_counter())
+            time.sleep(delay)
+
+    def record(self, latency: float) -> None:
+        """Feed back the latency of a finished operation"""
+        with self._lock:
+            self.ops += 1
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += (latency - self.latency) * LATENCY_SMOOTHING
+            if self.target_latency is None or self.ops % ADJUST_EVERY:
+                return
+            if self.latency > self.target_latency:
+                self.rate = max(self.min_rate, self.rate * BACKOFF)
+            elif self.latency < self.target_latency / 2:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY)
+
+    def format_report(self) -> str:
+        """Summary of the throttling applied"""
+        latency = f"{self.latency * 1000:.2f} ms" if self.latency is not None else "n/a"
+        rate = f"{self.rate:.0f} ops/s" if self.rate is not None else "unlimited"
+        return (f"🚦 Throttled {self.ops} operations: {self.waited:.2f} s spent waiting, "
+                f"final rate {rate}, average latency {latency}")
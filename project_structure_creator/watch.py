@@ -0,0 +1,88 @@
+"""
+Watch mode for Project Structure Creator
+
+Polls a spec file with os.stat (no external dependencies) and, whenever it
+changes, re-parses it and creates only the entries that are new compared to
+the last successfully applied parse, which is kept in memory as a path
+index. Nothing is ever deleted: entries removed from the spec, or changed
+between file and directory, are reported and left on disk.
+"""
+
+import os
+import time
+from typing import Callable, Optional, Tuple
+
+from .diff import diff_indexes, index_entries
+from .main import StructureParseError, _materialize, parse_structure, read_structure_lines
+from .throttle import OpScheduler
+
+
+def _signature(path: str) -> Optional[Tuple[int, int, int]]:
+    """Cheap change marker for a file, or None while it does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def watch_structure(input_file: str, output_dir: str, interval: float = 0.5,
+                    log: Callable[[str], None] = print, dedup: Optional[str] = None,
+                    max_changes: Optional[int] = None, scheduler: Optional[OpScheduler] = None) -> None:
+    """
+    Apply a spec file and keep re-applying its changes until interrupted.
+
+    Args:
+        input_file: Structure file to watch
+        output_dir: Base directory where the structure is created
+        interval: Seconds between stat polls
+        log: Callable receiving progress messages
+        dedup: Optional "hardlink" or "reflink", as for create_structure
+        max_changes: Stop after this many applied changes (None: run forever)
+        scheduler: Optional OpScheduler, as for create_structure
+    """
+    applied = None
+    last_signature = None
+    changes = 0
+
+    while max_changes is None or changes < max_changes:
+        signature = _signature(input_file)
+        if signature is None or signature == last_signature:
+            time.sleep(interval)
+            continue
+        last_signature = signature
+
+        started = time.perf_counter()
+        try:
+            entries = parse_structure(list(read_structure_lines(input_file)))
+        except (StructureParseError, OSError, UnicodeDecodeError) as e:
+            # Often a half-written save; the next change will be picked up
+            log(f"⚠️  Could not parse {input_file}: {e}")
+            continue
+        current = index_entries(entries)
+
+        if applied is None:
+            pending = list(current.items())
+            log(f"👀 Applying {len(pending)} entries from {input_file}")
+        else:
+            delta = diff_indexes(applied, current)
+            pending = delta.added
+            for path, is_dir in delta.removed:
+                log(f"Removed from spec, left on disk: {path}{'/' if is_dir else ''}")
+            for path, old_is_dir, new_is_dir in delta.type_changed:
+                log(f"Changed to {'directory' if new_is_dir else 'file'} in spec, left on disk: {path}")
+            if not (pending or delta.removed or delta.type_changed):
+                log(f"No structural changes in {input_file}")
+
+        try:
+            if pending:
+                _materialize(output_dir, pending, log, dedup, scheduler)
+        except Exception as e:
+            # Keep the previous state so the failed entries are retried next time
+            log(f"❌ Error: {e}")
+            continue
+
+        applied = current
+        changes += 1
+        log(f"✅ Up to date ({len(pending)} entries applied in "
+            f"{(time.perf_counter() - started) * 1000:.1f} ms), watching for changes...")
@@ -13,6 +13,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/Wiradjuri/project-structure-creator",
     packages=find_packages(),
+    py_modules=["project_structure_client"],
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -33,6 +34,7 @@ setup(
         "console_scripts": [
             "project-structure-creator=project_structure_creator.main:main",
             "project-structure-creator-gui=project_structure_creator.gui:run_gui",
+            "project-structure-client=project_structure_client:main",
         ],
     },
 )
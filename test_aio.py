@@ -0,0 +1,50 @@
+"""
+Tests for the asyncio API
+"""
+
+import asyncio
+
+from project_structure_creator.aio import create_structure_async, parse_structure_async
+
+
+def _paused_source(count, resume):
+    async def lines():
+        yield "root/"
+        for i in range(count - 1):
+            yield f"    f{i}.txt"
+        await resume.wait()
+        yield "    last.txt"
+    return lines()
+
+
+def test_parsed_entries_are_not_held_back_by_a_paused_source():
+    async def scenario():
+        resume = asyncio.Event()
+        received = []
+
+        async def consume():
+            async for entry in parse_structure_async(_paused_source(300, resume)):
+                received.append(entry)
+
+        task = asyncio.ensure_future(consume())
+        deadline = asyncio.get_running_loop().time() + 5
+        while len(received) < 300 and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.01)
+        seen_while_paused = len(received)
+        resume.set()
+        await asyncio.wait_for(task, 5)
+        return seen_while_paused, received
+
+    seen_while_paused, received = asyncio.run(scenario())
+    assert seen_while_paused == 300
+    assert received[0] == ("root", True)
+    assert len(received) == 301
+
+
+def test_create_structure_async_from_a_list(tmp_path):
+    async def scenario():
+        return [progress async for progress in create_structure_async(str(tmp_path), ["app/", "    main.py"])]
+
+    statuses = asyncio.run(scenario())
+    assert [progress.status for progress in statuses] == ["created", "created"]
+    assert (tmp_path / "app" / "main.py").is_file()
@@ -0,0 +1,58 @@
+"""
+Tests for size annotations and file content specs
+"""
+
+from itertools import product
+
+import pytest
+
+from project_structure_creator.content import FileSpec, has_size_annotation, parse_size, split_size_annotation
+
+_LETTERS = "KMGTPBIkmgtpbi"
+_CANDIDATE_UNITS = ["".join(chars) for length in (1, 2, 3) for chars in product(_LETTERS, repeat=length)]
+
+
+@pytest.mark.parametrize("text, size", [
+    ("512B", 512),
+    ("2KB", 2000),
+    ("2K", 2048),
+    ("2KiB", 2048),
+    ("3MB", 3 * 1000 ** 2),
+    ("3mib", 3 * 1024 ** 2),
+    ("1.5GiB", int(1.5 * 1024 ** 3)),
+    ("1TB", 1000 ** 4),
+    ("1P", 1024 ** 5),
+    ("7", 7),
+    (7, 7),
+])
+def test_parse_size(text, size):
+    assert parse_size(text) == size
+
+
+@pytest.mark.parametrize("text", ["4Mi", "4XB", "-1", "MB", -1])
+def test_parse_size_rejects_invalid_sizes(text):
+    with pytest.raises(ValueError):
+        parse_size(text)
+
+
+def test_every_annotated_unit_parses():
+    accepted = set()
+    for unit in _CANDIDATE_UNITS:
+        name = f"data [4{unit}]"
+        if not has_size_annotation(name):
+            continue
+        accepted.add(unit.upper())
+        base, spec = split_size_annotation(name)
+        assert base == "data"
+        assert spec.size == parse_size(f"4{unit}")
+    assert accepted == {"B"} | {prefix + suffix for prefix in "KMGTP" for suffix in ("", "B", "IB")}
+
+
+@pytest.mark.parametrize("name", ["data [4Mi]", "data [4Ki fill]", "photo [1]", "notes [draft]"])
+def test_names_without_a_valid_unit_stay_literal(name):
+    assert not has_size_annotation(name)
+    assert split_size_annotation(name) == (name, None)
+
+
+def test_annotation_with_mode_and_pattern():
+    assert split_size_annotation("blob.bin [2KiB fill=dead]") == ("blob.bin", FileSpec(2048, "fill", b"\xde\xad"))
@@ -0,0 +1,78 @@
+"""
+Tests for the daemon and its minimal client
+"""
+
+import gzip
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SPEC = "app/\n    src/\n        main.py\n    README.md\n"
+
+
+def _run(*args):
+    env = dict(os.environ, PYTHONPATH=HERE)
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, cwd=HERE)
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    socket_path = str(tmp_path / "d.sock")
+    env = dict(os.environ, PYTHONPATH=HERE)
+    server = subprocess.Popen([sys.executable, "-m", "project_structure_creator", "serve", "--socket", socket_path],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+    deadline = time.monotonic() + 10
+    while not os.path.exists(socket_path):
+        if server.poll() is not None or time.monotonic() > deadline:
+            server.kill()
+            pytest.skip("daemon did not start")
+        time.sleep(0.05)
+    yield socket_path
+    server.terminate()
+    server.wait(timeout=10)
+
+
+def test_client_does_not_import_the_package():
+    result = _run("-c", "import sys, project_structure_client; "
+                        "print(any(m.startswith('project_structure_creator') for m in sys.modules))")
+    assert result.stdout.strip() == "False"
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_client_creates_structure(daemon, tmp_path, compressed):
+    spec = tmp_path / ("spec.txt.gz" if compressed else "spec.txt")
+    spec.write_bytes(gzip.compress(SPEC.encode()) if compressed else SPEC.encode())
+    out = tmp_path / "out"
+
+    result = _run(os.path.join(HERE, "project_structure_client.py"), str(spec), str(out), "--socket", daemon)
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "(4 entries)" in result.stdout
+    assert (out / "app" / "src" / "main.py").is_file()
+    assert (out / "app" / "README.md").is_file()
+
+
+def test_connect_option_uses_the_same_protocol(daemon, tmp_path):
+    spec = tmp_path / "spec.txt"
+    spec.write_text(SPEC, encoding="utf-8")
+    out = tmp_path / "out"
+
+    result = _run("-m", "project_structure_creator", str(spec), str(out), "--connect", daemon)
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert (out / "app" / "src" / "main.py").is_file()
+
+
+def test_client_reports_missing_daemon(tmp_path):
+    spec = tmp_path / "spec.txt"
+    spec.write_text(SPEC, encoding="utf-8")
+
+    result = _run(os.path.join(HERE, "project_structure_client.py"), str(spec), str(tmp_path / "out"),
+                  "--socket", str(tmp_path / "missing.sock"))
+
+    assert result.returncode == 1
+    assert "Cannot connect to daemon" in result.stdout
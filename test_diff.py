@@ -0,0 +1,23 @@
+"""
+Tests for comparing and merging structures
+"""
+
+import pytest
+
+from project_structure_creator.diff import merge_structures
+
+
+@pytest.mark.parametrize("prefer", ["base", "other"])
+def test_merge_keeps_directory_with_children(prefer):
+    base = [("app", True), ("app/main.py", False)]
+    other = [("app", False)]
+    assert merge_structures(base, other, prefer) == base
+
+
+def test_merge_turns_base_file_into_directory_for_other_children():
+    merged = merge_structures([("docs", False)], [("docs/index.md", False)], prefer="base")
+    assert merged == [("docs", True), ("docs/index.md", False)]
+
+
+def test_merge_prefers_other_without_children():
+    assert merge_structures([("bin", True)], [("bin", False)]) == [("bin", False)]
@@ -0,0 +1,65 @@
+"""
+Tests for brace and range expansion
+"""
+
+import pytest
+
+from project_structure_creator.expand import count_expansions, expand_braces, expand_entries, first_expansion
+
+CASES = [
+    # Plain names and literal braces
+    ("main.py", ["main.py"]),
+    ("{a}", ["{a}"]),
+    ("{}", ["{}"]),
+    ("a{b", ["a{b"]),
+    ("a}b{c,d}", ["a}bc", "a}bd"]),
+    ("{a..}", ["{a..}"]),
+    ("{a}{b,c}", ["{a}b", "{a}c"]),
+    # Lists, nested lists and empty alternatives
+    ("part_{a,b,c}.dat", ["part_a.dat", "part_b.dat", "part_c.dat"]),
+    ("a{b,c{d,e}}f", ["abf", "acdf", "acef"]),
+    ("{{a,b}}", ["{a}", "{b}"]),
+    ("x{,_old}", ["x", "x_old"]),
+    # Numeric ranges: zero padding, negative and stepped
+    ("{1..3}", ["1", "2", "3"]),
+    ("shard_{000..3}", ["shard_000", "shard_001", "shard_002", "shard_003"]),
+    ("{08..10}", ["08", "09", "10"]),
+    ("{-2..2}", ["-2", "-1", "0", "1", "2"]),
+    ("{2..-2}", ["2", "1", "0", "-1", "-2"]),
+    ("{-05..5..5}", ["-05", "000", "005"]),
+    ("run_{1..10..3}", ["run_1", "run_4", "run_7", "run_10"]),
+    ("{10..1..3}", ["10", "7", "4", "1"]),
+    ("{1..3..0}", ["1", "2", "3"]),
+    ("{1..5..-2}", ["1", "3", "5"]),
+    # Letter ranges
+    ("{a..e..2}", ["a", "c", "e"]),
+    ("{e..a}", ["e", "d", "c", "b", "a"]),
+    ("{Z..b}", ["Z", "[", "\\", "]", "^", "_", "`", "a", "b"]),
+    # Several groups
+    ("grid_{a..b}{1,2}", ["grid_a1", "grid_a2", "grid_b1", "grid_b2"]),
+    ("{1..2}/{x,y}.txt", ["1/x.txt", "1/y.txt", "2/x.txt", "2/y.txt"]),
+]
+
+
+@pytest.mark.parametrize("text, expected", CASES)
+def test_expand_braces(text, expected):
+    assert list(expand_braces(text)) == expected
+
+
+@pytest.mark.parametrize("text, expected", CASES)
+def test_count_matches_expansion(text, expected):
+    assert count_expansions(text) == len(list(expand_braces(text))) == len(expected)
+
+
+@pytest.mark.parametrize("text", ["{0..999}{a,b}", "d{1..100}/{x,y{1..10}}", "{a..z}{0000..9999..7}"])
+def test_count_of_large_patterns(text):
+    assert count_expansions(text) == sum(1 for _ in expand_braces(text))
+
+
+def test_first_expansion():
+    assert first_expansion("shard_{000..999}.bin") == "shard_000.bin"
+    assert first_expansion("{a}") == "{a}"
+
+
+def test_expand_entries_keeps_kinds():
+    assert list(expand_entries([("d{1,2}", True), ("f.txt", False)])) == [("d1", True), ("d2", True), ("f.txt", False)]
@@ -0,0 +1,48 @@
+"""
+Tests for structure format detection and parsing
+"""
+
+import os
+
+import pytest
+
+from project_structure_creator.main import DETECT_LINES, iter_structure, parse_structure
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _read(name):
+    with open(os.path.join(HERE, name), encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+@pytest.mark.parametrize("name", ["structure.txt", "android_structure.txt", "test_tree_structure.txt"])
+def test_buffered_and_streamed_parsing_agree_on_samples(name):
+    lines = _read(name)
+    assert list(iter_structure(lines)) == parse_structure(lines)
+
+
+def test_format_is_detected_from_the_same_lines():
+    # A listing-style header after the detection window must not switch formats
+    lines = ["app/"] + [f"    f{i}.txt" for i in range(DETECT_LINES + 6)] + ["    logs:"]
+    buffered = parse_structure(lines)
+    assert list(iter_structure(lines)) == buffered
+    assert buffered[1] == (os.path.join("app", "f0.txt"), False)
+
+
+def test_markdown_after_detection_window_is_not_a_markdown_spec():
+    lines = [f"dir{i}/" for i in range(DETECT_LINES)] + ["- item"]
+    assert list(iter_structure(lines)) == parse_structure(lines)
+
+
+def test_json_size_mapping_is_a_sized_file():
+    assert parse_structure(['{"data": {"blob.bin": {"size": "2MB", "mode": "fill", "fill": "ab"}}}']) == [
+        ("data", True),
+        (os.path.join("data", "blob.bin") + " [2000000B fill=ab]", False),
+    ]
+
+
+@pytest.mark.parametrize("size", ['"small"', '"10"', '1.5', 'true'])
+def test_json_entry_named_size_stays_a_directory(size):
+    entries = parse_structure([f'{{"config": {{"size": {size}}}}}'])
+    assert entries[0] == ("config", True)
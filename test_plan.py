@@ -0,0 +1,85 @@
+"""
+Tests for creation plans and fan-out
+"""
+
+import threading
+import time
+
+import pytest
+
+from project_structure_creator.diff import index_entries
+from project_structure_creator.expand import expand_braces
+from project_structure_creator.main import parse_structure
+from project_structure_creator.plan import apply_plan, build_plan, create_structure_many, partition_plan
+
+SPEC = ["root/", "    sub/", "        deep/", "    a.txt"]
+
+
+def test_directory_count_includes_created_ancestors(tmp_path):
+    plan = build_plan([("root", True), ("root/sub", True), ("root/sub/deep", True), ("root/a.txt", False)])
+    assert plan.dirs == ["root/sub/deep"]
+
+    result = apply_plan(str(tmp_path), plan)
+    assert (result.dirs, result.files) == (3, 1)
+
+    again = apply_plan(str(tmp_path), plan)
+    assert (again.dirs, again.files, again.skipped) == (0, 0, 1)
+
+
+def test_results_are_reported_one_at_a_time(tmp_path):
+    active = []
+    overlapped = threading.Event()
+    lock = threading.Lock()
+
+    def report(result):
+        with lock:
+            active.append(result.target)
+            if len(active) > 1:
+                overlapped.set()
+        time.sleep(0.01)
+        with lock:
+            active.remove(result.target)
+
+    targets = [str(tmp_path / f"t{i}") for i in range(8)]
+    results = create_structure_many(targets, SPEC, max_workers=8, on_result=report)
+
+    assert not overlapped.is_set()
+    assert [result.dirs for result in results] == [4] * 8
+
+
+PARTITION_SPECS = [
+    ["app/", "    README.md", "    src/", "        a.py", "        b.py", "    docs/", "        x.md", "        y.md"],
+    ["app/", "    Makefile", "    lib/", "        core/", "            a.py", "            b.py", "        util.py",
+     "    tests/", "        t1.py", "        t2.py", "        t3.py", "docs/", "    index.md"],
+    ["tenant{1..6}/", "    config.yml", "    data/", "        blob.bin [1KB]"],
+]
+
+
+def _ancestors(path):
+    while "/" in path:
+        path = path.rpartition("/")[0]
+        yield path
+
+
+@pytest.mark.parametrize("spec", PARTITION_SPECS)
+@pytest.mark.parametrize("count", [1, 2, 3, 5])
+def test_partitions_are_disjoint_and_cover_the_spec(spec, count):
+    index = index_entries(parse_structure(spec))
+    expected_files = {path for pattern, is_dir in index.items() if not is_dir for path in expand_braces(pattern)}
+    expected_dirs = {path for pattern, is_dir in index.items() if is_dir for path in expand_braces(pattern)}
+
+    partitions = partition_plan(parse_structure(spec), count)
+
+    shared = set(partitions[0].shared_dirs)
+    created_by_shared = shared | {parent for path in shared for parent in _ancestors(path)}
+    files, dirs = [], []
+    for partition in partitions:
+        assert set(partition.shared_dirs) == shared
+        assert not created_by_shared & set(partition.plan.dirs)
+        files.extend(path for pattern, _ in partition.plan.files for path in expand_braces(pattern))
+        dirs.extend(path for pattern in partition.plan.dirs for path in expand_braces(pattern))
+    assert len(files) == len(set(files)) and len(dirs) == len(set(dirs))
+
+    assert {path.split(" [")[0] for path in files} == {path.split(" [")[0] for path in expected_files}
+    created = created_by_shared | set(dirs) | {parent for path in dirs + files for parent in _ancestors(path)}
+    assert created == expected_dirs
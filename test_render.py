@@ -0,0 +1,150 @@
+"""
+Tests for streamed rendering and --dry-run
+"""
+
+import argparse
+import importlib
+import tracemalloc
+
+import pytest
+
+from project_structure_creator.main import DETECT_LINES, iter_structure, parse_structure
+from project_structure_creator.render import OUTPUT_FORMATS, normalize_path, render_structure, render_structure_stream
+
+# The package exports the main() function under the module's name
+main = importlib.import_module("project_structure_creator.main")
+
+
+class _CountingSink:
+    """stdout replacement that keeps no output but samples traced memory per write"""
+
+    def __init__(self):
+        self.lines = 0
+        self.high = 0
+
+    def write(self, text):
+        self.lines += text.count("\n")
+        self.high = max(self.high, tracemalloc.get_traced_memory()[0])
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        pass
+
+
+def _single_root_lines(count):
+    yield "root/"
+    for i in range(count):
+        yield f"    dir{i // 100}/" if i % 100 == 0 else f"        f{i}.txt"
+
+
+def _dry_run_memory(tmp_path, count):
+    spec = tmp_path / f"spec{count}.txt"
+    spec.write_text("".join(line + "\n" for line in _single_root_lines(count)), encoding="utf-8")
+    args = argparse.Namespace(markdown=None, dry_run=True, format="tree")
+    sink = _CountingSink()
+    tracemalloc.start()
+    try:
+        main.sys.stdout, stdout = sink, main.sys.stdout
+        try:
+            main._run_dry_run(args, str(spec))
+        finally:
+            main.sys.stdout = stdout
+        return sink.high, sink.lines
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize("fmt", ["tree", "indented", "markdown", "json", "yaml"])
+def test_stream_matches_buffered_rendering(fmt):
+    entries = list(iter_structure(list(_single_root_lines(500))))
+    assert list(render_structure_stream(entries, fmt)) == list(render_structure(entries, fmt))
+
+
+ROUND_TRIP_SPEC = [
+    "app/",
+    "    Makefile",
+    "    LICENSE",
+    "    README",
+    "    .gitignore",
+    "    src/",
+    "        main.py",
+    "        assets/",
+    "    docs/",
+    "        guide.md",
+]
+
+
+def _index(entries):
+    return [(normalize_path(path), is_dir) for path, is_dir in entries]
+
+
+@pytest.mark.parametrize("fmt", OUTPUT_FORMATS)
+def test_rendered_output_parses_back_to_the_same_entries(fmt):
+    entries = parse_structure(ROUND_TRIP_SPEC)
+    assert ("app/Makefile", False) in _index(entries)
+    assert _index(parse_structure(list(render_structure(entries, fmt)))) == _index(entries)
+    assert _index(parse_structure(list(render_structure_stream(entries, fmt)))) == _index(entries)
+
+
+LS_R_OUTPUT = [
+    ".:",
+    "README.md",
+    "docs",
+    "src",
+    "",
+    "./docs:",
+    "a.md",
+    "",
+    "./src:",
+    "main.py",
+    "pkg",
+    "",
+    "./src/pkg:",
+    "m.py",
+]
+
+
+@pytest.mark.parametrize("yaml_like", [True, False])
+def test_dry_run_regroups_ls_r_listings(tmp_path, capsys, monkeypatch, yaml_like):
+    # Without PyYAML the listing is parsed as a stream rather than as a document
+    if not yaml_like:
+        monkeypatch.setattr(main, "_looks_like_yaml", lambda head: False)
+    spec = tmp_path / "listing.txt"
+    spec.write_text("\n".join(LS_R_OUTPUT) + "\n", encoding="utf-8")
+
+    main._run_dry_run(argparse.Namespace(markdown=None, dry_run=True, format="tree"), str(spec))
+
+    assert capsys.readouterr().out.splitlines() == list(render_structure(parse_structure(LS_R_OUTPUT)))
+
+
+def test_first_line_is_rendered_before_input_ends():
+    read = []
+
+    def produce():
+        for line in _single_root_lines(100000):
+            read.append(line)
+            yield line
+
+    output = render_structure_stream(iter_structure(produce()), "indented")
+    assert next(output) == "root/"
+    assert len(read) <= DETECT_LINES + 2
+
+
+def test_dry_run_memory_does_not_grow_with_the_spec(tmp_path, monkeypatch):
+    # Shard read-ahead is the largest buffer; keep it small and the pool eligible
+    monkeypatch.setattr(main, "SHARD_LINES", 1000)
+    monkeypatch.setattr(main.os, "cpu_count", lambda: 4)
+    # Name caches and the interned string table are bounded, but they grow and
+    # resize on their own schedule, which would hide what the pipeline holds
+    monkeypatch.setattr(main, "_normalize_name", main._normalize_name.__wrapped__)
+    monkeypatch.setattr(main, "_has_file_extension", main._has_file_extension.__wrapped__)
+    monkeypatch.setattr(main.sys, "intern", str)
+    # Warm up once-only allocations such as regex caches
+    _dry_run_memory(tmp_path, 1000)
+    small_memory, small_lines = _dry_run_memory(tmp_path, 10000)
+    large_memory, large_lines = _dry_run_memory(tmp_path, 50000)
+    assert (small_lines, large_lines) == (10001, 50001)
+    assert large_memory < small_memory * 1.5
@@ -0,0 +1,100 @@
+"""
+Tests for sharded tree/indented parsing
+"""
+
+import importlib
+import os
+
+import pytest
+
+from project_structure_creator.main import (_iter_tree_or_indented, _iter_tree_or_indented_sharded,
+                                            iter_structure)
+from project_structure_creator.sources import read_lines
+
+# The package exports the main() function under the module's name
+main = importlib.import_module("project_structure_creator.main")
+
+
+def _multi_root_spec(roots=12, children=15):
+    lines = []
+    for root in range(roots):
+        lines.append(f"top{root}/")
+        for child in range(children):
+            lines.append(f"    dir{child}/")
+            lines.append(f"        file{child}.txt")
+        lines.append(f"top{root}.md")
+    lines.append("tree/")
+    lines.append("├── src/")
+    lines.append("│   └── app.py")
+    lines.append("└── README.md")
+    return lines
+
+
+def _exit_in_worker(lines):
+    """Pool entry point that kills its worker process for one shard"""
+    if any(line.startswith("top6/") for line in lines):
+        os._exit(1)
+    return list(_iter_tree_or_indented(lines))
+
+
+@pytest.fixture
+def many_cpus(monkeypatch):
+    monkeypatch.setattr(main.os, "cpu_count", lambda: 4)
+
+
+def test_sharded_output_matches_serial(many_cpus):
+    lines = _multi_root_spec()
+    expected = list(_iter_tree_or_indented(lines))
+    assert list(_iter_tree_or_indented_sharded(lines, workers=2, shard_lines=20)) == expected
+
+
+def test_oversized_shard_falls_back_to_streaming(many_cpus):
+    # The third root is far larger than a shard, so sharding stops there
+    lines = _multi_root_spec(roots=3) + ["big/"] + [f"    f{i}.txt" for i in range(200)] + _multi_root_spec(roots=2)
+    expected = list(_iter_tree_or_indented(lines))
+    assert list(_iter_tree_or_indented_sharded(lines, workers=2, shard_lines=20)) == expected
+
+
+def test_killed_worker_loses_no_entries(many_cpus, monkeypatch):
+    monkeypatch.setattr(main, "_parse_shard", _exit_in_worker)
+    lines = _multi_root_spec()
+    expected = list(_iter_tree_or_indented(lines))
+    assert list(_iter_tree_or_indented_sharded(lines, workers=2, shard_lines=20)) == expected
+
+
+def test_single_cpu_never_starts_a_pool(monkeypatch):
+    monkeypatch.setattr(main.os, "cpu_count", lambda: 1)
+    monkeypatch.setattr(main, "_iter_top_level_shards", None)
+    lines = _multi_root_spec()
+    assert list(_iter_tree_or_indented_sharded(lines, workers=4, shard_lines=20)) == \
+        list(_iter_tree_or_indented(lines))
+
+
+def test_frozen_executable_never_starts_a_pool(many_cpus, monkeypatch):
+    monkeypatch.setattr(main.sys, "frozen", True, raising=False)
+    monkeypatch.setattr(main, "_iter_top_level_shards", None)
+    lines = _multi_root_spec()
+    assert list(_iter_tree_or_indented_sharded(lines, workers=4, shard_lines=20)) == \
+        list(_iter_tree_or_indented(lines))
+
+
+def test_first_entry_arrives_before_stream_ends(many_cpus, monkeypatch):
+    monkeypatch.setattr(main, "SHARD_LINES", 20)
+    read = []
+
+    def produce():
+        for line in ["root/"] + [f"    f{i}.txt" for i in range(100000)]:
+            read.append(line)
+            yield line
+
+    entries = iter_structure(produce())
+    assert next(entries) == ("root", True)
+    assert len(read) <= main.DETECT_LINES + 1
+
+
+def test_regular_files_are_complete_input(tmp_path):
+    spec = tmp_path / "spec.txt"
+    spec.write_text("root/\n    a.txt\n", encoding="utf-8")
+    assert read_lines(str(spec)).seekable()
+    assert main._is_complete_input(["root/"])
+    assert not main._is_complete_input(line for line in ["root/"])
@@ -0,0 +1,50 @@
+"""
+Tests for reading spec files
+"""
+
+import gzip
+
+import pytest
+
+from project_structure_creator.sources import index_lines, read_line_block, read_lines
+
+
+def test_plain_and_compressed_files_read_the_same(tmp_path):
+    text = "app/\r\n    main.py\r\n    docs/\n"
+    plain = tmp_path / "spec.txt"
+    plain.write_bytes(text.encode("utf-8"))
+    packed = tmp_path / "spec.bin"
+    packed.write_bytes(gzip.compress(text.encode("utf-8")))
+    assert list(read_lines(str(plain))) == list(read_lines(str(packed))) == ["app/", "    main.py", "    docs/"]
+
+
+def test_file_shrinking_while_read_ends_the_lines(tmp_path):
+    spec = tmp_path / "spec.txt"
+    spec.write_text("".join(f"    f{i}.txt\n" for i in range(200000)), encoding="utf-8")
+    lines = read_lines(str(spec))
+    assert next(lines) == "    f0.txt"
+    # Truncating a memory-mapped file here would kill the process with SIGBUS
+    with open(spec, "r+b") as f:
+        f.truncate(0)
+    assert len(list(lines)) < 200000
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_line_blocks_match_sequential_reading(tmp_path, compress):
+    text = "".join(f"    f{i}.txt\r\n" if i % 3 else f"d{i}/\n" for i in range(1003))
+    spec = tmp_path / "spec.txt"
+    spec.write_bytes(gzip.compress(text.encode("utf-8")) if compress else text.encode("utf-8"))
+    lines = list(read_lines(str(spec)))
+
+    count, offsets = index_lines(str(spec), 100)
+
+    assert count == len(lines) and len(offsets) == 11
+    for block, offset in reversed(list(enumerate(offsets))):
+        assert read_line_block(str(spec), offset, 100) == lines[block * 100:(block + 1) * 100]
+
+
+def test_empty_file_has_one_empty_block(tmp_path):
+    spec = tmp_path / "spec.txt"
+    spec.write_bytes(b"")
+    assert index_lines(str(spec), 100) == (0, [0])
+    assert read_line_block(str(spec), 0, 100) == []
@@ -0,0 +1,83 @@
+"""
+Tests for instrumentation and trace export
+"""
+
+import json
+import threading
+import time
+
+from project_structure_creator import stats
+
+
+def _trace(recorder, tmp_path):
+    path = tmp_path / "trace.json"
+    recorder.write_chrome_trace(str(path))
+    return json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+
+
+def _spans(events, name):
+    return [event for event in events if event["name"] == name and event["ph"] == "X"]
+
+
+def test_trace_records_every_call_when_it_ran(tmp_path):
+    recorder = stats.StructureStats(trace=True)
+    for _ in range(3):
+        with recorder.phase("outer"):
+            time.sleep(0.002)
+            with recorder.phase("inner"):
+                time.sleep(0.001)
+        time.sleep(0.002)
+    recorder.finish()
+
+    events = _trace(recorder, tmp_path)
+    run, = _spans(events, "run")
+    outer, inner = _spans(events, "outer"), _spans(events, "inner")
+    assert len(outer) == len(inner) == 3
+    for parent, child in zip(outer, inner):
+        # Nested calls sit inside their parent, which sits inside the run, on one track
+        assert parent["tid"] == child["tid"] == run["tid"]
+        assert run["ts"] <= parent["ts"] <= child["ts"]
+        assert child["ts"] + child["dur"] <= parent["ts"] + parent["dur"] <= run["ts"] + run["dur"]
+    # Successive calls are separate spans with gaps between them
+    assert outer[0]["ts"] + outer[0]["dur"] < outer[1]["ts"]
+
+
+def test_worker_threads_get_their_own_tracks(tmp_path):
+    recorder = stats.StructureStats(trace=True)
+    worker = threading.Thread(target=lambda: recorder.add_time("mkdir", 0.001), name="fanout-1")
+    worker.start()
+    worker.join()
+    with recorder.phase("plan"):
+        pass
+    recorder.finish()
+
+    events = _trace(recorder, tmp_path)
+    names = {event["tid"]: event["args"]["name"] for event in events if event["ph"] == "M"}
+    assert names[_spans(events, "mkdir")[0]["tid"]] == "fanout-1"
+    assert _spans(events, "plan")[0]["tid"] == _spans(events, "run")[0]["tid"]
+
+
+def test_trace_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(stats, "MAX_TRACE_SPANS", 5)
+    recorder = stats.StructureStats(trace=True)
+    for _ in range(3):
+        with recorder.phase("write"):
+            pass
+    list(recorder.timed_iter("parse.tree", range(4)))
+    recorder.finish()
+
+    events = _trace(recorder, tmp_path)
+    assert len(_spans(events, "write")) + len(_spans(events, "parse.tree")) == 5
+    assert _spans(events, "run")[0]["args"]["dropped_spans"] == 2
+    assert recorder.to_dict()["phases"]["parse.tree"]["calls"] == 4
+
+
+def test_without_tracing_only_totals_are_written(tmp_path):
+    recorder = stats.StructureStats()
+    with recorder.phase("plan"):
+        pass
+    recorder.finish()
+
+    events = _trace(recorder, tmp_path)
+    assert [event["name"] for event in events if event["ph"] == "X"] == ["run"]
+    assert _spans(events, "run")[0]["args"]["phases"]["plan"]["calls"] == 1